@@ -0,0 +1,96 @@
+"""
+bench_control_server.py — Load test for the local control API.
+
+Starts a headless session in a temporary folder with the control server
+listening, then sends marks from several concurrent clients:
+one command per round trip, and pipelined in batches. Reports marks per
+second and round-trip latency, and checks that every mark reached the log.
+
+Usage:
+    python benchmarks/bench_control_server.py [--marks 20000] [--clients 4] [--batch 100]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import HeadlessSession, TimestampManager  # noqa: E402
+from timestamp_control import HAS_UNIX_SOCKETS, ControlServer  # noqa: E402
+
+
+def client(address, marks, batch, latencies):
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        request = b"mark\n" * batch
+        buffered = b""
+        for _ in range(marks // batch):
+            start = time.perf_counter()
+            sock.sendall(request)
+            received = 0
+            while received < batch:
+                buffered += sock.recv(65536)
+                *lines, buffered = buffered.split(b"\n")
+                received += len(lines)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run(address, marks, clients, batch):
+    latencies = []
+    threads = [
+        threading.Thread(target=client, args=(address, marks // clients, batch, latencies))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    sent = (marks // clients // batch) * batch * clients
+    return sent, sent / elapsed, statistics.median(latencies), max(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--marks", type=int, default=20000, help="Marks per mode")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent connections")
+    parser.add_argument("--batch", type=int, default=100, help="Commands per pipelined write")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TimestampManager(base_path=tmp)
+        session = HeadlessSession(manager, tmp)
+        session.execute("new bench.md")
+        session.execute("start")
+        server = ControlServer(
+            session.execute,
+            socket_path=os.path.join(tmp, "control.sock"),
+            tcp_port=0 if HAS_UNIX_SOCKETS else 4456,
+        )
+        if not server.start():
+            sys.exit(f"Server failed to start: {server.error}")
+
+        print(f"{'mode':<22}{'marks':>8}{'marks/s':>12}{'median ms':>12}{'max ms':>10}")
+        total = 0
+        for name, batch in (("one per round trip", 1), (f"pipelined x{args.batch}", args.batch)):
+            sent, rate, median, worst = run(server.address, args.marks, args.clients, batch)
+            total += sent
+            print(f"{name:<22}{sent:>8}{rate:>12.0f}{median:>12.2f}{worst:>10.2f}")
+
+        server.stop()
+        session.close()
+        with open(os.path.join(tmp, "bench.md"), encoding="utf-8") as f:
+            logged = sum(1 for line in f if line.startswith("*  **["))
+        print(f"\nMarks in the log: {logged} of {total}")
+
+
+if __name__ == "__main__":
+    main()
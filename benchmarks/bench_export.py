@@ -0,0 +1,89 @@
+"""
+bench_export.py — Throughput of the bulk exporter over a synthetic archive.
+
+Writes an archive of session files (marks, custom notes, voice notes,
+screenshots, scene changes and shorts, several takes per file), then exports
+it to every format in one process and across a process pool, reporting
+files, entries and megabytes per second.
+
+Usage:
+    python benchmarks/bench_export.py [--files 500] [--marks 400] [--workers 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import TimelineEvent  # noqa: E402
+from timestamp_export import export_archive  # noqa: E402
+
+NOTES = ["", "", "", "Boss fight", "Clutch", "Funny moment", "Death", "Loot"]
+WORDS = "what a play that was incredible let's clip this one for the highlights".split()
+SCENES = ["Gameplay", "Just Chatting", "BRB", "Menu"]
+
+
+def session_text(rng, marks, takes=2):
+    """Render a session file the way TimestampManager would write it."""
+    chunks = []
+    for take in range(takes):
+        elapsed = 0.0
+        chunks.append(TimelineEvent(TimelineEvent.START, payload=f"[01-05][20-0{take}-00]").render())
+        for counter in range(1, marks + 1):
+            elapsed += rng.uniform(2, 30)
+            roll = rng.random()
+            if roll < 0.05:
+                chunks.append(TimelineEvent(TimelineEvent.SCENE, elapsed, payload=rng.choice(SCENES)).render())
+            elif roll < 0.07:
+                chunks.append(TimelineEvent(TimelineEvent.SHORT, elapsed, payload="[01-05][20-30-00]").render())
+            kind = TimelineEvent.SCREENSHOT if roll > 0.9 else TimelineEvent.MARK
+            payload = f"shot_{counter}.png" if kind == TimelineEvent.SCREENSHOT else rng.choice(NOTES)
+            chunks.append(TimelineEvent(kind, elapsed, counter, payload).render())
+            if roll < 0.2:
+                words = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+                chunks.append(TimelineEvent(TimelineEvent.VOICE, elapsed, payload=words).render())
+        chunks.append(TimelineEvent(TimelineEvent.STOP, elapsed + 5).render())
+    return "".join(chunks)
+
+
+def build_archive(root, files, marks):
+    rng = random.Random(0)
+    total = 0
+    for i in range(files):
+        folder = os.path.join(root, f"2025-{i % 12 + 1:02}")
+        os.makedirs(folder, exist_ok=True)
+        text = session_text(rng, marks).encode("utf-8")
+        with open(os.path.join(folder, f"session_{i:05}.md"), "wb") as f:
+            f.write(text)
+        total += len(text)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="Session files in the archive")
+    parser.add_argument("--marks", type=int, default=400, help="Marks per take (two takes per file)")
+    parser.add_argument("--workers", type=int, default=0, help="Pool size (default: one per CPU)")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "Timestamp_TXT")
+        size = build_archive(archive, args.files, args.marks)
+        print(f"Archive: {args.files} files, {size / 1e6:.1f} MB\n")
+        print(f"{'mode':<18}{'seconds':>10}{'files/s':>10}{'entries/s':>12}{'MB/s':>8}")
+        modes = [("1 process", 1)] + ([(f"{workers} processes", workers)] if workers > 1 else [])
+        for name, count in modes:
+            summary = export_archive(archive, os.path.join(tmp, f"out_{count}"), workers=count)
+            if summary["errors"]:
+                sys.exit(f"Export errors: {summary['errors'][:3]}")
+            seconds = summary["seconds"]
+            print(f"{name:<18}{seconds:>10.2f}{summary['files'] / seconds:>10.0f}"
+                  f"{summary['entries'] / seconds:>12.0f}{size / 1e6 / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+bench_hotkey_dispatch.py — Listener overhead per keystroke.
+
+The pynput listener is global, so every key typed in a game or chat goes
+through `_on_press`/`_on_release`. Both hand each event to HotkeyDispatcher
+(key name, index lookup, press stamp, held-key state), which is what this
+times, against the original handler that probed key attributes and rebuilt
+the key -> action dict on every event. Keys are stand-ins with the shape of
+pynput's: an Enum for special keys and objects with a `char` for the rest,
+in a typing-like stream of mostly unbound keys. It also reports the peak
+allocation while rejecting one unbound key many times, net of the loop
+itself: the original's is the dict it rebuilt on every event, while the
+dispatcher's few bytes are a one-time interpreter cache that stays the same
+whatever the number of keys.
+
+Usage:
+    python benchmarks/bench_hotkey_dispatch.py [--keys 200000]
+"""
+
+import argparse
+import enum
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import HotkeyDispatcher  # noqa: E402
+
+# Same shape as the app's defaults, with a few custom notes bound
+KEYBINDS = {
+    'create_file': 'f5', 'start_recording': 'f6', 'mark_time': 'f7',
+    'stop_recording': 'f8', 'save_short': 'f9', 'mark_voice_note': 'f10',
+    'take_screenshot': 'f11', 'mark_ptt_voice_note': '', 'save_burst': '',
+    'custom_note_1': 'f1', 'custom_note_2': 'f2', 'custom_note_3': '',
+    'custom_note_4': '', 'custom_note_5': '',
+}
+
+
+# Stand-ins for pynput.keyboard.Key (an Enum) and pynput.keyboard.KeyCode
+Key = enum.Enum("Key", [f"f{n}" for n in range(1, 13)] + ["space", "shift", "enter", "backspace"])
+
+
+class KeyCode:
+    __slots__ = ("char",)
+
+    def __init__(self, char):
+        self.char = char
+
+
+def keystrokes(count, bound_ratio=0.01):
+    """Mostly letters and common special keys, with the odd bound hotkey."""
+    rng = random.Random(0)
+    typing = [KeyCode(c) for c in string.ascii_lowercase + string.digits]
+    typing += [Key.space, Key.shift, Key.enter, Key.backspace]
+    bound = [Key[key] for key in KEYBINDS.values() if key]
+    return [rng.choice(bound) if rng.random() < bound_ratio else rng.choice(typing) for _ in range(count)]
+
+
+def original_handler(keybinds):
+    """The app's handlers before the dispatch index, as they were in the GUI."""
+    pressed = set()
+
+    def get_key_str(key):
+        if hasattr(key, 'name'): return key.name
+        if hasattr(key, 'char'): return key.char
+        return 'unknown'
+
+    def on_press(key):
+        key_str = get_key_str(key)
+        if key_str in pressed:
+            return None
+        pressed.add(key_str)
+        key_to_action = {v: k for k, v in keybinds.items() if v}
+        return key_to_action.get(key_str)
+
+    def on_release(key):
+        key_str = get_key_str(key)
+        if key_str in pressed:
+            pressed.remove(key_str)
+        key_to_action = {v: k for k, v in keybinds.items() if v}
+        return key_to_action.get(key_str)
+
+    return on_press, on_release
+
+
+def dispatcher_handler(keybinds):
+    hotkeys = HotkeyDispatcher(keybinds)
+    return hotkeys.press, hotkeys.release
+
+
+def run(handlers, keys):
+    on_press, on_release = handlers
+    start = time.perf_counter_ns()
+    for key in keys:
+        on_press(key)
+        on_release(key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def _loop_peak(on_press, on_release, key, repeats):
+    on_press(key)
+    on_release(key)
+    tracemalloc.start()
+    for _ in range(repeats):
+        on_press(key)
+        on_release(key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def unbound_allocations(handlers, key, repeats=10000):
+    """Peak bytes allocated while rejecting the same unbound key many times, net of the loop itself."""
+    def ignore(key):
+        return None
+
+    return _loop_peak(*handlers, key, repeats) - _loop_peak(ignore, ignore, key, repeats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200000, help="Keystrokes to replay")
+    args = parser.parse_args()
+
+    keys = keystrokes(args.keys)
+    variants = {
+        "rebuild per event": lambda: original_handler(KEYBINDS),
+        "HotkeyDispatcher": lambda: dispatcher_handler(KEYBINDS),
+    }
+
+    print(f"{args.keys} keystrokes (press + release), ~1% bound\n")
+    print(f"{'handler':<20}{'ns/key':>10}{'peak B (letter)':>17}{'peak B (Key.space)':>20}")
+    for name, make in variants.items():
+        per_key = run(make(), keys)
+        letter = unbound_allocations(make(), KeyCode('a'))
+        special = unbound_allocations(make(), Key.space)
+        print(f"{name:<20}{per_key:>10.0f}{letter:>17}{special:>20}")
+
+
+if __name__ == "__main__":
+    main()
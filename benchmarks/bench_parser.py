@@ -0,0 +1,129 @@
+"""
+bench_parser.py — Session parser throughput and memory on multi-MB logs.
+
+Writes one long session log (marks, custom notes, voice notes, screenshots,
+scene changes and shorts), then reads its lines with:
+  - read() + splitlines(), the whole file in memory at once
+  - text-mode line iteration
+  - mmap + readline
+  - timestamp_parser.read_lines (block reads, as parse_file uses)
+reporting MB/s for the lines alone and once parsed, entries/s, and the peak
+memory allocated while parsing. Each figure is the best of --runs runs; a
+single run is dominated by noise. It also times reading the HUD's last lines
+from the end of the file, as opening a session does.
+
+Usage:
+    python benchmarks/bench_parser.py [--mb 20] [--runs 3]
+"""
+
+import argparse
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import TimelineEvent  # noqa: E402
+from timestamp_parser import parse_lines, read_lines, tail_display_lines  # noqa: E402
+
+NOTES = ["", "", "", "Boss fight", "Clutch", "Funny moment", "Death", "Loot"]
+WORDS = "what a play that was incredible let's clip this one for the highlights".split()
+
+
+def write_log(path, target_bytes):
+    """Append takes of generated entries until the file reaches `target_bytes`."""
+    rng = random.Random(0)
+    size = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        while size < target_bytes:
+            chunks = [TimelineEvent(TimelineEvent.START, payload="[01-05][20-00-00]").render()]
+            elapsed = 0.0
+            for counter in range(1, 5001):
+                elapsed += rng.uniform(0.5, 20)
+                roll = rng.random()
+                if roll < 0.03:
+                    chunks.append(TimelineEvent(TimelineEvent.SCENE, elapsed, payload="Gameplay").render())
+                kind = TimelineEvent.SCREENSHOT if roll > 0.9 else TimelineEvent.MARK
+                payload = f"shot_{counter}.png" if kind == TimelineEvent.SCREENSHOT else rng.choice(NOTES)
+                chunks.append(TimelineEvent(kind, elapsed, counter, payload).render())
+                if roll < 0.15:
+                    words = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+                    chunks.append(TimelineEvent(TimelineEvent.VOICE, elapsed, payload=words).render())
+            chunks.append(TimelineEvent(TimelineEvent.STOP, elapsed + 5).render())
+            text = "".join(chunks)
+            f.write(text)
+            size += len(text.encode("utf-8"))
+    return size
+
+
+def whole_file(path):
+    with open(path, encoding="utf-8") as f:
+        yield from f.read().splitlines()
+
+
+def text_lines(path):
+    with open(path, encoding="utf-8") as f:
+        yield from f
+
+
+def mmap_lines(path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b""):
+            yield line.decode("utf-8", "replace")
+
+
+def best_time(func, runs):
+    """Return (fastest seconds, result) over `runs` calls."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def measure(reader, path, runs):
+    """Return (line seconds, parse seconds, entries, peak bytes allocated while parsing)."""
+    line_seconds, _ = best_time(lambda: sum(1 for _ in reader(path)), runs)
+    parse_seconds, entries = best_time(lambda: sum(1 for _ in parse_lines(reader(path))), runs)
+    tracemalloc.start()
+    sum(1 for _ in parse_lines(reader(path)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return line_seconds, parse_seconds, entries, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=float, default=20, help="Size of the generated log")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per figure; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "long_session.md")
+        size = write_log(path, int(args.mb * 1e6))
+        print(f"Log: {size / 1e6:.1f} MB\n")
+        print(f"{'reader':<22}{'lines MB/s':>11}{'parsed MB/s':>12}{'entries/s':>12}{'peak MB':>10}")
+        readers = {
+            "read() + splitlines()": whole_file,
+            "text-mode lines": text_lines,
+            "mmap + readline": mmap_lines,
+            "read_lines (blocks)": read_lines,
+        }
+        for name, reader in readers.items():
+            line_seconds, parse_seconds, entries, peak = measure(reader, path, args.runs)
+            print(f"{name:<22}{size / 1e6 / line_seconds:>11.1f}{size / 1e6 / parse_seconds:>12.1f}"
+                  f"{entries / parse_seconds:>12.0f}{peak / 1e6:>10.2f}")
+
+        start = time.perf_counter()
+        lines = tail_display_lines(path, 5)
+        print(f"\nLast {len(lines)} HUD lines from the end: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+bench_screenshot_encoder.py — Encode time and file size per screenshot profile.
+
+Renders synthetic frames (gradients, noise and flat UI-like panels, which
+compress roughly like a game capture) and saves each one with every profile,
+reporting the median encode time and the resulting file size.
+
+Usage:
+    python benchmarks/bench_screenshot_encoder.py [--runs 5] [--size 3840x2160]
+
+Requires: pip install Pillow
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import ScreenshotProfile  # noqa: E402
+
+PROFILES = {
+    "png (PIL default, level 6)": ScreenshotProfile("png", png_compress_level=6),
+    "png fast (level 1)": ScreenshotProfile("png", png_compress_level=1),
+    "png fast, max 1920": ScreenshotProfile("png", png_compress_level=1, max_width=1920),
+    "jpeg q85": ScreenshotProfile("jpeg", quality=85),
+    "jpeg q85, max 1920": ScreenshotProfile("jpeg", quality=85, max_width=1920),
+    "webp q80": ScreenshotProfile("webp", quality=80),
+}
+
+
+def synthetic_frame(width, height):
+    """Build a frame with smooth gradients, sensor-like noise and flat HUD panels."""
+    from PIL import Image, ImageDraw
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    frame = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    draw = ImageDraw.Draw(frame)
+    for i in range(12):
+        x = (i * width) // 12
+        draw.rectangle([x + 10, height - 180, x + width // 14, height - 40], fill=(30, 30, 30))
+        draw.text((x + 20, height - 160), f"HUD {i}", fill=(240, 240, 240))
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Encodes per profile")
+    parser.add_argument("--size", default="3840x2160", help="Frame size WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    frame = synthetic_frame(width, height)
+    print(f"Frame {width}x{height}, {args.runs} runs per profile\n")
+    print(f"{'profile':<28}{'median ms':>12}{'KB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profile in PROFILES.items():
+            path = os.path.join(tmp, "shot" + profile.extension)
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                profile.save(frame, path)
+                timings.append((time.perf_counter() - start) * 1000)
+            size_kb = os.path.getsize(path) / 1024
+            print(f"{name:<28}{statistics.median(timings):>12.1f}{size_kb:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
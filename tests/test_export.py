@@ -0,0 +1,41 @@
+"""Chapter lists written by the exporter."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_export import export_file  # noqa: E402
+from timestamp_functions import TimelineEvent  # noqa: E402
+
+
+class ChapterExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def chapters(self, marks):
+        """Export a one-take session of (seconds, note) marks; return the chapter lines."""
+        path = os.path.join(self.tmp.name, "session.md")
+        events = [TimelineEvent(TimelineEvent.START, payload="[01-05][20-00-00]")]
+        events += [TimelineEvent(TimelineEvent.MARK, seconds, n, note) for n, (seconds, note) in enumerate(marks, 1)]
+        events.append(TimelineEvent(TimelineEvent.STOP, marks[-1][0] + 5))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(event.render() for event in events))
+        _, written = export_file(path, os.path.join(self.tmp.name, "out"), formats=("chapters",))
+        with open(written[0], encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_first_early_entry_names_the_opening_chapter(self):
+        lines = self.chapters([(2, "Intro"), (4, "Setup"), (7, "Warmup"), (30, "Boss fight")])
+        self.assertEqual(lines, ["0:00 Intro", "0:30 Boss fight"])
+
+    def test_chapters_closer_than_the_minimum_are_dropped(self):
+        lines = self.chapters([(20, "One"), (25, "Too close"), (40, "Two")])
+        self.assertEqual(lines, ["0:00 Start", "0:20 One", "0:40 Two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Edit-versus-append merge cases for SessionJournal, checked against what reaches the file."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timestamp_functions import SessionJournal, SessionWriter, TimestampManager  # noqa: E402
+
+
+class SessionJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.md")
+        self.writer = SessionWriter()
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def journal(self, initial=None):
+        if initial is not None:
+            with open(self.path, "wb") as f:
+                f.write(initial.encode("utf-8"))
+        return SessionJournal(self.path, self.writer)
+
+    def on_disk(self):
+        self.writer.flush()
+        with open(self.path, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def test_appends_reach_the_file_and_the_text(self):
+        journal = self.journal("start\n")
+        for i in range(100):
+            journal.append(f"line {i}\n")
+        expected = "start\n" + "".join(f"line {i}\n" for i in range(100))
+        self.assertEqual(journal.text, expected)
+        self.assertEqual(self.on_disk(), expected)
+
+    def test_changes_since_returns_only_the_new_tail(self):
+        journal = self.journal("head\n")
+        version, text = journal.snapshot()
+        journal.append("a\n")
+        journal.append("b\n")
+        new_version, offset, tail = journal.changes_since(version, len(text))
+        self.assertEqual((new_version, offset, tail), (version + 2, len(text), "a\nb\n"))
+
+    def test_changes_since_reports_an_edit_before_the_viewer_end(self):
+        journal = self.journal("one\ntwo\n")
+        version, text = journal.snapshot()
+        journal.commit_edits("ONE\ntwo\n", version)
+        journal.append("three\n")
+        _, offset, tail = journal.changes_since(version, len(text))
+        self.assertEqual(offset, 0)
+        self.assertEqual(tail, "ONE\ntwo\nthree\n")
+
+    def test_edit_keeps_events_appended_after_the_snapshot(self):
+        journal = self.journal("notes\n")
+        version, text = journal.snapshot()
+        journal.append("*  **[1]**   **[00:00:01]** - \n")  # Hotkey while the user was typing
+        journal.commit_edits("my notes\n", version)
+        expected = "my notes\n*  **[1]**   **[00:00:01]** - \n"
+        self.assertEqual(journal.text, expected)
+        self.assertEqual(self.on_disk(), expected)
+
+    def test_edit_against_a_rewritten_base_keeps_the_users_view(self):
+        journal = self.journal("abc\n")
+        version, _ = journal.snapshot()
+        journal.commit_edits("xyz\n")  # Another edit lands first
+        journal.append("tail\n")
+        journal.commit_edits("abc changed\n", version)
+        self.assertEqual(journal.text, "abc changed\n")
+        self.assertEqual(self.on_disk(), "abc changed\n")
+
+    def test_unchanged_commit_writes_nothing(self):
+        journal = self.journal("same\n")
+        version, text = journal.snapshot()
+        self.assertEqual(journal.commit_edits(text, version), version)
+
+    def test_crlf_files_keep_their_line_endings(self):
+        journal = self.journal("a\r\nb\r\n")
+        version, text = journal.snapshot()
+        self.assertEqual(text, "a\nb\n")
+        journal.append("c\n")
+        journal.commit_edits("A\nb\n", version)
+        self.writer.flush()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"A\r\nb\r\nc\r\n")
+
+    def test_manager_save_keeps_the_trailing_newline(self):
+        manager = TimestampManager(base_path=self.tmp.name)
+        self.addCleanup(manager.close)
+        manager.open_file(self.path)
+        manager.start_recording()
+        manager.stop_recording()
+        version, text = manager.journal.snapshot()
+        self.assertTrue(text.endswith("\n"))
+        edited = "My notes\n" + text  # As the viewer returns it, up to "end-1c"
+        new_version = manager.save_changes(edited, base_version=version)
+        manager.writer.flush()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), edited)
+        manager.mark_scene("Gameplay")  # Not recording: nothing appended
+        manager.save_short()
+        _, offset, tail = manager.journal.changes_since(new_version, len(edited))
+        self.assertEqual(offset, len(edited))
+        self.assertEqual(edited + tail, manager.journal.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
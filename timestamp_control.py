@@ -0,0 +1,342 @@
+"""
+timestamp_control.py — Local control API for the Nilvarcus Timestamp App.
+
+Lets a Stream Deck, a macro pad or a script trigger the same actions as the
+hotkeys without a global key press:
+  - Line protocol on a Unix domain socket (localhost TCP on Windows):
+    one command per line, one JSON response line per command, in order.
+    Clients may pipeline — everything that arrives together is executed
+    and answered with a single write.
+  - Optional localhost HTTP: POST /<command>[?arg=...], or POST / with
+    one command per line in the body. Requests that carry an Origin header
+    (sent by browsers) or name a non-loopback Host are refused, so web pages
+    and DNS rebinding cannot drive it; 'new' and 'open' are not served.
+
+Commands are the ones of the headless mode (mark [note], short, screenshot,
+scene NAME, start, stop, status, ...). Responses look like
+{"ok": true, "value": "[00:01:02]"} or {"ok": false, "error": "not recording"};
+a JSON request {"cmd": "mark", "arg": "Boss", "id": 7} gets its id echoed back.
+
+Only loopback interfaces are bound; the server is off unless enabled in Settings
+or started with `python -m timestamp_functions --headless --control`.
+
+Client usage (e.g. from a Stream Deck "run program" action):
+    python timestamp_control.py mark "Boss fight"
+"""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from timestamp_functions import SessionClock
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "nilvarcus-timestamp.sock")
+DEFAULT_TCP_PORT = 4456  # Line protocol where Unix sockets are unavailable
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX") and hasattr(asyncio, "start_unix_server")
+
+READ_CHUNK = 64 * 1024
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "[::1]"}
+
+
+class ControlServer:
+    """
+    Asyncio control server running on its own daemon thread.
+
+    Commands run one at a time on the server thread, in arrival order, via
+    `execute(line, at_ns)` (HeadlessSession.execute). `at_ns` is taken when the
+    bytes are read, so queueing behind a batch does not shift the marks.
+    `on_activity` (optional) is called once per executed batch, e.g. to refresh the GUI.
+    """
+
+    BLOCKED_COMMANDS = {'quit'}  # Closing the app is left to its own window/console
+    HTTP_BLOCKED_COMMANDS = BLOCKED_COMMANDS | {'new', 'open'}  # No file paths from HTTP clients
+
+    def __init__(self, execute, socket_path=None, http_port=0, on_activity=None, tcp_port=DEFAULT_TCP_PORT):
+        self._execute = execute
+        self.socket_path = socket_path or DEFAULT_SOCKET_PATH
+        self.tcp_port = tcp_port
+        self.http_port = http_port
+        self._on_activity = on_activity
+
+        self._loop = None
+        self._thread = None
+        self._stopped = None
+        self._ready = threading.Event()
+        self.error = None
+
+    # ── Public API ──────────────────────────────────────────────────────────
+
+    @property
+    def address(self):
+        """Where the line protocol listens: a socket path, or ('127.0.0.1', port)."""
+        return self.socket_path if HAS_UNIX_SOCKETS else ("127.0.0.1", self.tcp_port)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, timeout=5):
+        """
+        Start serving in the background.
+
+        Returns:
+            bool: True once listening, False if binding failed (see `error`).
+        """
+        if self.running:
+            return True
+        self._ready.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self.error is None and self.running
+
+    def stop(self, timeout=5):
+        """
+        Stop serving and remove the socket file.
+
+        Waits up to `timeout` seconds for the server thread; with 0 it returns at
+        once and the thread finishes on its own.
+        """
+        if self._loop and self._stopped and self.running:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join(timeout)
+        self._thread = None
+
+    # ── Internal: server loop ────────────────────────────────────────────────
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self.error = str(e)
+            print(f"[Control] Server error: {e}")
+        finally:
+            self._ready.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        servers = []
+        try:
+            if HAS_UNIX_SOCKETS:
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)  # Left over from a crashed run
+                servers.append(await asyncio.start_unix_server(self._handle_lines, path=self.socket_path))
+                os.chmod(self.socket_path, 0o600)
+            else:
+                servers.append(await asyncio.start_server(self._handle_lines, "127.0.0.1", self.tcp_port))
+            if self.http_port:
+                servers.append(await asyncio.start_server(self._handle_http, "127.0.0.1", self.http_port))
+        except Exception as e:
+            self.error = str(e)
+            for server in servers:
+                server.close()
+            return
+
+        print(f"[Control] Listening on {self.address}" + (f" and http://127.0.0.1:{self.http_port}" if self.http_port else ""))
+        self._ready.set()
+        await self._stopped.wait()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        if HAS_UNIX_SOCKETS and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _run_batch(self, requests, at_ns, blocked=None):
+        """Execute parsed requests in order; return the encoded response lines."""
+        blocked = self.BLOCKED_COMMANDS if blocked is None else blocked
+        out = []
+        for request_id, line in requests:
+            command = line.split(" ", 1)[0].lower()
+            if command in blocked:
+                reply = f"error '{command}' is not available over the control API"
+            else:
+                reply = self._execute(line, at_ns)
+            out.append(encode_reply(reply, request_id))
+        if out and self._on_activity:
+            self._on_activity()
+        return out
+
+    async def _handle_lines(self, reader, writer):
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(READ_CHUNK)
+                if not chunk:
+                    break
+                at_ns = SessionClock.now_ns()
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()  # Incomplete last line, if any
+                if lines and lines[0].rstrip().endswith((b" HTTP/1.0", b" HTTP/1.1")):
+                    break  # A browser posting to the line port; never run its body as commands
+                requests = [parse_request(line) for line in lines if line.strip()]
+                if requests:
+                    writer.write(b"".join(self._run_batch(requests, at_ns)))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # Client closed, possibly mid-request
+                except asyncio.LimitOverrunError:
+                    writer.write(http_response("400 Bad Request", encode_reply("error request headers too large")))
+                    await writer.drain()
+                    break
+                at_ns = SessionClock.now_ns()
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = (request_line.split(" ") + ["", ""])[:3]
+                headers = {}
+                for header in header_lines:
+                    name, _, value = header.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = b""
+                if headers.get("content-length"):
+                    try:
+                        length = int(headers["content-length"])
+                        if not 0 <= length <= READ_CHUNK:
+                            raise ValueError(length)
+                    except ValueError:
+                        writer.write(http_response("400 Bad Request", encode_reply("error bad Content-Length")))
+                        await writer.drain()
+                        break
+                    try:
+                        body = await reader.readexactly(length)
+                    except asyncio.IncompleteReadError:
+                        # Body cut short; answer in case the client still reads
+                        writer.write(http_response("400 Bad Request", encode_reply("error request body cut short")))
+                        await writer.drain()
+                        break
+
+                status, payload = self._http_dispatch(method, target, headers, body, at_ns)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _http_dispatch(self, method, target, headers, body, at_ns):
+        """Return (status line, body bytes) for one HTTP request."""
+        if method != "POST":
+            return "405 Method Not Allowed", encode_reply("error use POST")
+        if "origin" in headers:
+            # Browsers add Origin to cross-site POSTs; scripts and Stream Deck actions do not
+            return "403 Forbidden", encode_reply("error requests from web pages are not accepted")
+        if not is_loopback_host(headers.get("host", "127.0.0.1")):
+            return "403 Forbidden", encode_reply("error Host must be a loopback address")
+        url = urlsplit(target)
+        command = unquote(url.path.strip("/"))
+        if not command:
+            if not body.strip():
+                return "400 Bad Request", encode_reply("error POST one command per line to /")
+            requests = [parse_request(line) for line in body.split(b"\n") if line.strip()]
+            return "200 OK", b"".join(self._run_batch(requests, at_ns, self.HTTP_BLOCKED_COMMANDS))
+        arg = parse_qs(url.query).get("arg", [""])[0] or body.decode("utf-8", "replace").strip()
+        line = f"{command} {arg}".strip()
+        return "200 OK", b"".join(self._run_batch([(None, line)], at_ns, self.HTTP_BLOCKED_COMMANDS))
+
+
+def parse_request(raw):
+    """Turn one request line (plain text or JSON) into (id, command line)."""
+    text = raw.decode("utf-8", "replace").strip()
+    if text.startswith("{"):
+        try:
+            data = json.loads(text)
+            return data.get("id"), f"{data.get('cmd', '')} {data.get('arg', '')}".strip()
+        except (ValueError, AttributeError):
+            return None, "invalid-json"
+    return None, text
+
+
+def is_loopback_host(host):
+    """True if an HTTP Host header (port optional) names this machine's loopback address."""
+    host = host.strip().lower()
+    if host.startswith("["):
+        host = host[:host.find("]") + 1]
+    else:
+        host = host.partition(":")[0]
+    return host in LOOPBACK_HOSTS
+
+
+def http_response(status, payload, keep_alive=False):
+    """Encode one HTTP/1.1 response with a JSON body."""
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode("latin-1") + payload
+
+
+def encode_reply(reply, request_id=None):
+    """Encode a HeadlessSession reply ("ok ..." / "error ...") as one JSON line."""
+    status, _, value = reply.partition(" ")
+    if status == "ok":
+        data = {"ok": True, "value": value}
+    else:
+        data = {"ok": False, "error": value}
+    if request_id is not None:
+        data["id"] = request_id
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def send_commands(lines, address=None, timeout=5):
+    """
+    Send command lines over the line protocol and return the decoded replies.
+
+    All lines are written at once (pipelined) before the replies are read.
+    """
+    address = address or (DEFAULT_SOCKET_PATH if HAS_UNIX_SOCKETS else ("127.0.0.1", DEFAULT_TCP_PORT))
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall("".join(line.rstrip("\n") + "\n" for line in lines).encode("utf-8"))
+        replies = []
+        buffered = b""
+        while len(replies) < len(lines):
+            chunk = sock.recv(READ_CHUNK)
+            if not chunk:
+                break
+            buffered += chunk
+            *complete, buffered = buffered.split(b"\n")
+            replies.extend(json.loads(line) for line in complete)
+        return replies
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Send a command to a running Timestamp App.")
+    parser.add_argument("--socket", help=f"Control socket path (default {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("command", help="e.g. mark, short, screenshot, status")
+    parser.add_argument("arg", nargs="*", help="Optional argument, e.g. the note text")
+    args = parser.parse_args(argv)
+
+    line = " ".join([args.command] + args.arg)
+    try:
+        reply = send_commands([line], args.socket)[0]
+    except (OSError, IndexError) as e:
+        print(f"Could not reach the Timestamp App control server: {e}", file=sys.stderr)
+        return 2
+    print(reply.get("value") if reply["ok"] else reply.get("error"))
+    return 0 if reply["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,412 @@
+"""
+timestamp_export.py — Export session files to formats editors can import.
+
+Reads a session Markdown file once, with timestamp_parser, and writes any of:
+  - chapters:  YouTube chapter list (0:00 first, chapters at least 10 s apart)
+  - edl:       CMX3600 EDL with one marker per entry (DaVinci Resolve marker syntax)
+  - srt:       SubRip subtitles of the voice notes
+  - json:      every parsed entry, for scripts
+
+Each recording (take) in a file gets its own chapters/EDL/SRT; the first take
+keeps the plain name and later ones get `.take2`, `.take3`, ... Scene changes
+and shorts carry no time in the Markdown, so their times are taken from the
+session's `.events.jsonl` log when it exists.
+
+CLI:
+    python timestamp_export.py "D:/Timestamp_TXT/[01-05-2025][20-00-00] - Run.md"
+    python timestamp_export.py --all --formats chapters,edl --workers 8
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from timestamp_functions import SessionLog, TimelineEvent
+from timestamp_index import default_output_dir, session_files
+from timestamp_parser import parse_file
+
+FORMATS = ("chapters", "edl", "srt", "json")
+EXPORT_DIR_NAME = "Exports"  # Default batch output folder, inside the archive
+
+CHAPTER_MIN_SECONDS = 10  # YouTube ignores chapters shorter than this
+CHAPTER_KINDS = {TimelineEvent.MARK, TimelineEvent.SCENE}
+SUBTITLE_KINDS = {TimelineEvent.VOICE, TimelineEvent.LATE_VOICE}
+# Entries without a time in the Markdown, matched to the event log in order
+LOG_TIMED_KINDS = {TimelineEvent.SCENE, TimelineEvent.SHORT, TimelineEvent.SHORT_ERROR}
+
+# One encoder for every entry: json.dumps with options builds a new one per call
+_json_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+EDL_START_SECONDS = 3600  # NLE timelines start at 01:00:00:00
+EDL_COLORS = {
+    TimelineEvent.MARK: "ResolveColorBlue",
+    TimelineEvent.SCREENSHOT: "ResolveColorCyan",
+    TimelineEvent.BURST: "ResolveColorCyan",
+    TimelineEvent.SCENE: "ResolveColorGreen",
+    TimelineEvent.SHORT: "ResolveColorRed",
+    TimelineEvent.SHORT_ERROR: "ResolveColorRed",
+    TimelineEvent.VOICE: "ResolveColorPurple",
+    TimelineEvent.LATE_VOICE: "ResolveColorPurple",
+}
+
+
+# ── Time formatting ─────────────────────────────────────────────────────────
+
+def chapter_time(seconds):
+    """YouTube chapter time: M:SS, or H:MM:SS from one hour on."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02}:{secs:02}" if hours else f"{minutes}:{secs:02}"
+
+
+def timecode(frames, fps):
+    """Non-drop-frame SMPTE timecode HH:MM:SS:FF for a frame count."""
+    total_seconds, ff = divmod(frames, fps)
+    hours, rest = divmod(total_seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02}:{minutes:02}:{secs:02}:{ff:02}"
+
+
+def srt_time(seconds):
+    """SubRip time HH:MM:SS,mmm."""
+    millis = int(round(seconds * 1000))
+    total_seconds, ms = divmod(millis, 1000)
+    hours, rest = divmod(total_seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02}:{minutes:02}:{secs:02},{ms:03}"
+
+
+def entry_label(entry):
+    """Short one-line description of an entry, for chapter titles and markers."""
+    text = " ".join(entry.payload.split())
+    if entry.kind == TimelineEvent.MARK:
+        return text or f"Mark {entry.counter}"
+    if entry.kind == TimelineEvent.SCREENSHOT:
+        return f"Screenshot {entry.counter}"
+    if entry.kind == TimelineEvent.BURST:
+        return f"Burst {entry.counter}"
+    if entry.kind == TimelineEvent.SCENE:
+        return f"Scene: {text}"
+    if entry.kind in SUBTITLE_KINDS:
+        return f"Voice: {text}"
+    if entry.kind == TimelineEvent.SHORT:
+        return "Short"
+    if entry.kind == TimelineEvent.SHORT_ERROR:
+        return "Short failed (no replay buffer)"
+    return text
+
+
+# ── Event log ───────────────────────────────────────────────────────────────
+
+def log_times(session_path):
+    """
+    Read the stopwatch times of scene changes and shorts from a session's event log.
+
+    Returns:
+        dict: kind -> deque of (payload, elapsed seconds), in log order. Empty if there is no log.
+    """
+    times = {kind: deque() for kind in LOG_TIMED_KINDS}
+    for record in SessionLog(session_path, None).records():
+        if record.get("k") in times and record.get("e") is not None:
+            times[record["k"]].append((record.get("p") or "", record["e"]))
+    return times
+
+
+def _take_log_time(pending, payload):
+    """Pop the first logged record with this payload, and any unmatched ones before it."""
+    for position, (logged_payload, elapsed) in enumerate(pending):
+        if logged_payload.strip() == payload:
+            for _ in range(position + 1):
+                pending.popleft()
+            return elapsed
+    return None  # Edited in the file, or logged by an older version
+
+
+def read_entries(path, fps=60, use_log=True):
+    """
+    Yield the entries of a session file, with scene and short times filled in from its log.
+
+    Args:
+        path (str): Session Markdown file.
+        fps (int): Frame rate of '[HH:MM:SS:FF]' times.
+        use_log (bool): Look up times missing from the Markdown in `<path>.events.jsonl`.
+    """
+    times = log_times(path) if use_log else {}
+    for entry in parse_file(path, fps):
+        if entry.seconds is None and entry.kind in times:
+            entry.seconds = _take_log_time(times[entry.kind], entry.payload)
+        yield entry
+
+
+# ── Writers ─────────────────────────────────────────────────────────────────
+
+class SessionExporter:
+    """
+    Write the chosen formats for one session file in a single pass over it.
+
+    The EDL and JSON are written as entries arrive. Chapters and subtitles are
+    filtered and sorted by time (late voice notes come after later entries in
+    the file), so those two keep the current take's entries until it ends.
+    """
+
+    def __init__(self, path, out_base, formats=FORMATS, fps=60, use_log=True,
+                 edl_start=EDL_START_SECONDS, chapter_min_seconds=CHAPTER_MIN_SECONDS):
+        """
+        Args:
+            path (str): Session Markdown file.
+            out_base (str): Output path without extension, e.g. 'Exports/session'.
+            formats (Iterable[str]): Any of FORMATS.
+            fps (int): Frame rate for EDL timecode and '[HH:MM:SS:FF]' times.
+            use_log (bool): Fill scene and short times from the event log.
+            edl_start (float): Timeline start of the EDL, in seconds.
+            chapter_min_seconds (float): Minimum gap between chapters.
+        """
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+        self.path = path
+        self.out_base = out_base
+        self.formats = set(formats)
+        self.fps = fps
+        self.use_log = use_log
+        self.edl_start = edl_start
+        self.chapter_min_seconds = chapter_min_seconds
+        self.written = []
+        self._take = None
+        self._edl = None
+        self._edl_events = 0
+        self._chapters = []
+        self._subtitles = []
+
+    def run(self):
+        """
+        Export the file.
+
+        Returns:
+            tuple: (number of entries read, list of written file paths).
+        """
+        os.makedirs(os.path.dirname(self.out_base) or ".", exist_ok=True)
+        count = 0
+        json_file = self._open("json") if "json" in self.formats else None
+        try:
+            if json_file:
+                source = _json_encode(os.path.basename(self.path))
+                json_file.write(f'{{"source": {source}, "fps": {self.fps}, "entries": [')
+            for entry in read_entries(self.path, self.fps, self.use_log):
+                if json_file:
+                    json_file.write(("\n" if count == 0 else ",\n") + _json_encode(self._entry_dict(entry)))
+                count += 1
+                take = max(entry.take, 1)  # Entries above the first start line belong to take 1
+                if take != self._take:
+                    self._end_take()
+                    self._take = take
+                if entry.seconds is not None:
+                    self._add_timed(entry)
+            self._end_take()
+            if json_file:
+                json_file.write("\n]}\n")
+        finally:
+            if self._edl:
+                self._edl.close()
+            if json_file:
+                json_file.close()
+        return count, self.written
+
+    def _open(self, extension):
+        """Open one output file of the current take for writing."""
+        suffix = f".take{self._take}" if self._take and self._take > 1 else ""
+        path = f"{self.out_base}{suffix}.{extension}"
+        self.written.append(path)
+        return open(path, "w", encoding="utf-8", newline="\n")
+
+    @staticmethod
+    def _entry_dict(entry):
+        return {
+            "kind": entry.kind, "line": entry.line_no, "take": entry.take, "counter": entry.counter,
+            "time": entry.time, "seconds": entry.seconds, "text": entry.payload,
+        }
+
+    def _add_timed(self, entry):
+        if "edl" in self.formats and entry.kind in EDL_COLORS:
+            self._add_edl_marker(entry)
+        if "chapters" in self.formats and entry.kind in CHAPTER_KINDS and entry.payload:
+            self._chapters.append((entry.seconds, entry_label(entry)))
+        if "srt" in self.formats and entry.kind in SUBTITLE_KINDS and entry.payload:
+            self._subtitles.append((entry.seconds, entry.payload))
+
+    def _add_edl_marker(self, entry):
+        if self._edl is None:
+            self._edl = self._open("edl")
+            title = os.path.splitext(os.path.basename(self.path))[0]
+            self._edl.write(f"TITLE: {title}\nFCM: NON-DROP FRAME\n\n")
+        self._edl_events += 1
+        frame = int(round((self.edl_start + entry.seconds) * self.fps))
+        start, end = timecode(frame, self.fps), timecode(frame + 1, self.fps)
+        name = entry_label(entry).replace("|", "/")
+        self._edl.write(
+            f"{self._edl_events:03}  001      V     C        {start} {end} {start} {end}  \n"
+            f" |C:{EDL_COLORS[entry.kind]} |M:{name} |D:1\n\n"
+        )
+
+    def _end_take(self):
+        """Flush the chapters and subtitles of the take that just ended."""
+        if self._edl:
+            self._edl.close()
+            self._edl = None
+            self._edl_events = 0
+        if self._chapters:
+            with self._open("chapters.txt") as f:
+                for seconds, title in self._chapter_list():
+                    f.write(f"{chapter_time(seconds)} {title}\n")
+        if self._subtitles:
+            with self._open("srt") as f:
+                self._write_srt(f)
+        self._chapters = []
+        self._subtitles = []
+
+    def _chapter_list(self):
+        """Apply YouTube's rules: first chapter at 0:00, then at least chapter_min_seconds apart."""
+        chapters = [(0, "Start")]
+        named = False  # Whether an early entry has named the opening chapter yet
+        for seconds, title in sorted(self._chapters, key=lambda c: c[0]):
+            if seconds < self.chapter_min_seconds and len(chapters) == 1:
+                if not named:
+                    chapters[0] = (0, title)  # The first early entry names the opening chapter
+                    named = True
+            elif seconds - chapters[-1][0] >= self.chapter_min_seconds:
+                chapters.append((seconds, title))
+        return chapters
+
+    def _write_srt(self, f):
+        subtitles = sorted(self._subtitles, key=lambda s: s[0])
+        for number, (start, text) in enumerate(subtitles, 1):
+            # Long enough to read (about 3 words a second), but never over the next note
+            end = start + min(max(2.0, len(text.split()) / 3), 7.0)
+            if number < len(subtitles):
+                end = min(end, subtitles[number][0])
+            end = max(end, start + 0.5)
+            f.write(f"{number}\n{srt_time(start)} --> {srt_time(end)}\n{text}\n\n")
+
+
+# ── Public API ──────────────────────────────────────────────────────────────
+
+def export_file(path, out_base=None, formats=FORMATS, **options):
+    """
+    Export one session file; see SessionExporter for the options.
+
+    By default the output goes to an Exports folder next to the file, where
+    the archive walk (and the search index) will not mistake it for a session.
+
+    Returns:
+        tuple: (number of entries read, list of written file paths).
+    """
+    if out_base is None:
+        directory, name = os.path.split(os.path.abspath(path))
+        out_base = os.path.join(directory, EXPORT_DIR_NAME, os.path.splitext(name)[0])
+    return SessionExporter(path, out_base, formats, **options).run()
+
+
+def _export_job(job):
+    """Process pool worker: export one file, reporting errors instead of raising."""
+    path, out_base, formats, options = job
+    try:
+        count, written = export_file(path, out_base, formats, **options)
+        return path, count, len(written), None
+    except (OSError, ValueError) as e:
+        return path, 0, 0, str(e)
+
+
+def export_archive(root, out_dir=None, formats=FORMATS, workers=None, **options):
+    """
+    Export every session file under `root`, mirroring its folders under `out_dir`.
+
+    Files are spread over a process pool; parsing and formatting are CPU-bound,
+    so threads would take turns on the GIL.
+
+    Args:
+        root (str): Archive folder (e.g. Timestamp_TXT).
+        out_dir (str): Output folder; defaults to `<root>/Exports`.
+        formats (Iterable[str]): Any of FORMATS.
+        workers (int): Processes to use; None for one per CPU, 1 to stay in this process.
+
+    Returns:
+        dict: files, entries, outputs, errors (list of (path, message)), seconds.
+    """
+    root = os.path.abspath(root)
+    out_dir = out_dir or os.path.join(root, EXPORT_DIR_NAME)
+    formats = tuple(formats)
+    jobs = [
+        (entry.path, os.path.join(out_dir, os.path.splitext(os.path.relpath(entry.path, root))[0]), formats, options)
+        for entry in session_files(root)
+    ]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) < 2:
+        results = [_export_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Batches of files per task keep the inter-process traffic small
+            results = list(pool.map(_export_job, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+
+    summary = {"files": len(jobs), "entries": 0, "outputs": 0, "errors": [], "seconds": 0.0}
+    for path, count, outputs, error in results:
+        summary["entries"] += count
+        summary["outputs"] += outputs
+        if error:
+            summary["errors"].append((path, error))
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export timestamp session files as chapters, EDL, SRT or JSON.")
+    parser.add_argument("files", nargs="*", help="Session files to export")
+    parser.add_argument("--all", action="store_true", help="Export every session file in --dir")
+    parser.add_argument("--dir", default=None, help="Archive folder for --all (default: the app's output folder)")
+    parser.add_argument("--out", default=None, help="Output folder (default: an Exports folder in the session's folder)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help=f"Comma-separated, any of {', '.join(FORMATS)}")
+    parser.add_argument("--fps", type=int, default=60, help="Frame rate for EDL timecode and frame-style times")
+    parser.add_argument("--edl-start", type=float, default=EDL_START_SECONDS, help="EDL timeline start in seconds")
+    parser.add_argument("--no-log", action="store_true", help="Ignore .events.jsonl logs")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for --all (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    if not args.files and not args.all:
+        parser.error("give session files, or --all")
+    options = {"fps": args.fps, "use_log": not args.no_log, "edl_start": args.edl_start}
+
+    if args.all:
+        summary = export_archive(args.dir or default_output_dir(), args.out, formats, args.workers, **options)
+        for path, error in summary["errors"]:
+            print(f"[Export] {path}: {error}")
+        rate = summary["files"] / summary["seconds"] if summary["seconds"] else 0
+        print(f"Exported {summary['files']} files ({summary['entries']} entries, {summary['outputs']} outputs) "
+              f"in {summary['seconds']:.2f} s — {rate:.0f} files/s")
+        return 1 if summary["errors"] else 0
+
+    failed = False
+    for path in args.files:
+        out_base = os.path.join(args.out, os.path.splitext(os.path.basename(path))[0]) if args.out else None
+        try:
+            count, written = export_file(path, out_base, formats, **options)
+        except OSError as e:
+            print(f"[Export] {path}: {e}")
+            failed = True
+            continue
+        print(f"{path}: {count} entries")
+        for output in written:
+            print(f"  → {output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
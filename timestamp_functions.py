@@ -1,35 +1,1317 @@
 import time
 import os
+import json
+import queue
+import shutil
+import tempfile
+import threading
+import bisect
+from collections import deque
+from itertools import islice
 from datetime import datetime
-from pynput import keyboard
+from enum import Enum
+from types import MappingProxyType
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """Length of the common prefix of two strings (binary search over C-level slice compares)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class SessionWriter:
+    """
+    Single background thread that owns every write to session files.
+
+    Callers enqueue append / rewrite operations in the order they happened; the
+    thread drains whatever is queued, applies it per file with one open and one
+    fsync per batch, so bursts (e.g. rapid scene switching) cost few syscalls
+    and nothing ever writes from a stale snapshot.
+
+    Appends go to the end of the file in place; rewrites (user edits) are
+    written to a temp file and renamed over the original, so a crash
+    mid-rewrite leaves either the old or the new log, never a truncated one.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="SessionWriter", daemon=True)
+        self._thread.start()
+
+    def append(self, path, data: bytes):
+        """Queue `data` to be appended to `path`."""
+        self._queue.put(("append", path, 0, data))
+
+    def write_at(self, path, offset: int, data: bytes):
+        """Queue an atomic rewrite of `path` from byte `offset` onwards (the file ends after `data`)."""
+        self._queue.put(("write_at", path, offset, data))
+
+    def flush(self, timeout=None):
+        """
+        Block until every operation queued so far is on disk.
+
+        Returns:
+            bool: True if the queue drained, False on timeout.
+        """
+        done = threading.Event()
+        self._queue.put(("flush", None, 0, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Flush pending writes and stop the writer thread."""
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Drain everything already queued into the same batch
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            self._apply([op for op in batch if op is not None])
+            if stop:
+                return
+
+    def _apply(self, batch):
+        files = {}  # path -> handle open for appending during this batch
+        waiters = []
+        for kind, path, offset, data in batch:
+            if kind == "flush":
+                waiters.append(data)
+                continue
+            # Errors are per operation: one unwritable path must not drop the
+            # writes queued behind it for other files (or for the event log)
+            try:
+                if kind == "write_at":
+                    self._sync_close(files.pop(path, None))
+                    self._rewrite(path, offset, data)
+                    continue
+                file = files.get(path)
+                if file is None:
+                    file = files[path] = open(path, "ab")
+                file.write(data)
+            except Exception as e:
+                print(f"Session write error ({path}): {e}")
+        for path, file in files.items():
+            try:
+                self._sync_close(file)
+            except Exception as e:
+                print(f"Session write error ({path}): {e}")
+        for done in waiters:
+            done.set()
+
+    @staticmethod
+    def _rewrite(path, offset, data):
+        """Replace `path` with its first `offset` bytes followed by `data`, via temp file + rename."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                if os.path.exists(path):
+                    shutil.copymode(path, tmp_path)
+                    with open(path, "rb") as original:
+                        tmp.write(original.read(offset))
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, path)
+        except PermissionError:
+            # Windows refuses the rename while another program has the log open;
+            # fall back to rewriting in place rather than losing the edit.
+            os.unlink(tmp_path)
+            with open(path, "r+b") as file:
+                file.seek(offset)
+                file.write(data)
+                file.truncate()
+                file.flush()
+                os.fsync(file.fileno())
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _sync_close(file):
+        if file is not None:
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+
+
+class SessionJournal:
+    """
+    Append-only journal for a single session file.
+
+    Keeps the file contents in memory as the known base so that new events are
+    appended to disk instead of rewriting the whole file, and user edits from the
+    text viewer are written as a diff (only the bytes after the first change).
+
+    Every mutation bumps `version` and records where it started, which lets
+    callers holding an older snapshot merge their edits with anything that was
+    appended in the meantime (e.g. OBS scene markers from another thread).
+
+    The journal itself never touches the file after loading it: mutations are
+    handed to the shared SessionWriter in the same order they are applied here.
+    """
+
+    def __init__(self, path, writer):
+        self.path = path
+        self.writer = writer
+        self._lock = threading.Lock()
+        # Make sure earlier queued writes to this path are on disk before reading it
+        writer.flush()
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        raw = data.decode("utf-8", errors="replace")
+        # Keep whatever line endings the file already uses; new files get the platform default.
+        if "\r\n" in raw:
+            self.newline = "\r\n"
+        elif "\n" in raw:
+            self.newline = "\n"
+        else:
+            self.newline = os.linesep
+        # The text is kept as the chunks it was appended in, with their cumulative end
+        # offsets, and only joined when the whole of it is needed: a str attribute
+        # grown with += is copied in full on every append.
+        text = raw.replace("\r\n", "\n")
+        self._chunks = [text]
+        self._ends = [len(text)]
+        self.version = 0
+        # history[v] = (char offset where mutation v started, text length after it)
+        self._history = [(0, len(text))]
+        if not data:
+            writer.append(path, b"")  # Ensure the file exists
+
+    def _encode(self, text):
+        if self.newline != "\n":
+            text = text.replace("\n", self.newline)
+        return text.encode("utf-8")
+
+    def _record(self, offset):
+        self.version += 1
+        self._history.append((offset, self._ends[-1]))
+
+    def _joined(self):
+        """The whole text, joining the appended chunks into one first. Call with the lock held."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._ends = [self._ends[-1]]
+        return self._chunks[0]
+
+    def _tail(self, offset):
+        """text[offset:] without joining the chunks before `offset`. Call with the lock held."""
+        index = bisect.bisect_right(self._ends, offset)
+        if index == len(self._chunks):
+            return ""
+        start = self._ends[index - 1] if index else 0
+        return self._chunks[index][offset - start:] + "".join(self._chunks[index + 1:])
+
+    @property
+    def text(self):
+        """The current file contents (with '\n' line endings)."""
+        with self._lock:
+            return self._joined()
+
+    def snapshot(self):
+        """Return a consistent (version, text) pair."""
+        with self._lock:
+            return self.version, self._joined()
+
+    def changes_since(self, version, length):
+        """
+        Describe what changed for a viewer that mirrors text[:length] at `version`.
+
+        Args:
+            version (int): Journal version the viewer was last synced to.
+            length (int): Number of leading characters the viewer holds.
+
+        Returns:
+            tuple: (current_version, offset, text[offset:]). When `offset == length`
+                   the change is a pure append and the returned text is the new tail.
+        """
+        with self._lock:
+            offset = min(length, self._ends[-1])
+            history = self._history
+            for index in range(version + 1, len(history)):
+                if history[index][0] < offset:
+                    offset = history[index][0]
+            return self.version, offset, self._tail(offset)
+
+    def append(self, chunk):
+        """
+        Append text to the end of the session file.
+
+        Args:
+            chunk (str): Text to append.
+
+        Returns:
+            int: The new journal version.
+        """
+        with self._lock:
+            offset = self._ends[-1]
+            self.writer.append(self.path, self._encode(chunk))
+            self._chunks.append(chunk)
+            self._ends.append(offset + len(chunk))
+            self._record(offset)
+            return self.version
+
+    def commit_edits(self, edited_text, base_version=None):
+        """
+        Persist user edits made against the snapshot at `base_version`.
+
+        Anything appended to the journal after that snapshot is kept after the
+        edited text, so events written concurrently are never dropped. Only the
+        part of the file after the first changed character is rewritten.
+
+        Args:
+            edited_text (str): Full edited text as shown to the user.
+            base_version (int, optional): Version the edits were made against.
+                                          Defaults to the current version.
+
+        Returns:
+            int: The journal version after the commit.
+        """
+        with self._lock:
+            if base_version is None or base_version > self.version:
+                base_version = self.version
+            base_len = self._history[base_version][1]
+            later = self._history[base_version + 1:]
+            if all(offset >= base_len for offset, _ in later):
+                new_text = edited_text + self._tail(base_len)
+            else:
+                # The base itself was rewritten since the snapshot; the user's view wins.
+                new_text = edited_text
+
+            text = self._joined()
+            prefix = _common_prefix_len(text, new_text)
+            if prefix == len(text) == len(new_text):
+                return self.version
+
+            byte_offset = len(self._encode(text[:prefix]))
+            self.writer.write_at(self.path, byte_offset, self._encode(new_text[prefix:]))
+            self._chunks = [new_text]
+            self._ends = [len(new_text)]
+            self._record(prefix)
+            return self.version
+
+
+def read_lines_backwards(path, block_size=8192):
+    """
+    Yield the lines of a file from last to first, reading it backwards in blocks.
+
+    Only as much of the file as the caller consumes is read, so looking at the
+    tail of a long session log costs the same as a short one.
+    """
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            file.seek(position)
+            lines = (file.read(step) + remainder).split(b"\n")
+            # The first piece may be a partial line; keep it for the next block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        yield remainder.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+class SessionClock:
+    """
+    Monotonic stopwatch with nanosecond resolution.
+
+    Built on time.perf_counter_ns, so it never jumps when the wall clock is
+    adjusted (NTP, DST) and keeps sub-millisecond precision. Callers capture
+    `now_ns()` at the moment something happens and pass it along, so the
+    recorded time does not include any later queueing or file I/O.
+    """
+
+    def __init__(self):
+        self.start_ns = None
+
+    @staticmethod
+    def now_ns():
+        return time.perf_counter_ns()
+
+    @property
+    def running(self):
+        return self.start_ns is not None
+
+    def start(self, at_ns=None):
+        self.start_ns = at_ns if at_ns is not None else self.now_ns()
+
+    def stop(self):
+        self.start_ns = None
+
+    def elapsed_ns(self, at_ns=None):
+        """Nanoseconds between the start and `at_ns` (default: now), or None if stopped."""
+        if self.start_ns is None:
+            return None
+        if at_ns is None:
+            at_ns = self.now_ns()
+        return max(0, at_ns - self.start_ns)
+
+    def elapsed(self, at_ns=None):
+        """Elapsed seconds as a float, or None if stopped."""
+        elapsed_ns = self.elapsed_ns(at_ns)
+        return None if elapsed_ns is None else elapsed_ns / 1e9
+
+
+class ElapsedFormat:
+    """
+    How stopwatch times are written to the log.
+
+    Styles:
+        "seconds":      [HH:MM:SS]
+        "milliseconds": [HH:MM:SS.mmm]
+        "frames":       [HH:MM:SS:FF] with FF the frame number at `fps`
+
+    Hours are not wrapped, so marathon sessions show [25:03:10] rather than [01:03:10].
+    """
+
+    STYLES = ("seconds", "milliseconds", "frames")
+
+    def __init__(self, style="seconds", fps=60):
+        self.style = style if style in self.STYLES else "seconds"
+        self.fps = fps
+
+    def __call__(self, seconds):
+        """Format elapsed seconds (empty string when there is no time)."""
+        if seconds is None:
+            return ""
+        whole = int(seconds)
+        hours, rest = divmod(whole, 3600)
+        minutes, secs = divmod(rest, 60)
+        base = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        if self.style == "milliseconds":
+            return f"[{base}.{int((seconds - whole) * 1000):03d}]"
+        if self.style == "frames":
+            return f"[{base}:{int((seconds - whole) * self.fps):02d}]"
+        return f"[{base}]"
+
+
+# Default '[HH:MM:SS]' formatting
+format_elapsed = ElapsedFormat()
+
+
+class LatencyStats:
+    """
+    Distribution of the delay between an action's stamp and the moment its event is recorded.
+
+    Events are stamped when the action is requested (hotkey press, control-API
+    read, button click, headless command), so this delay no longer shifts the
+    log; it shows how far behind the entries would have been, and how busy the
+    Tk queue is. Only the most recent `max_samples` delays are kept.
+    """
+
+    def __init__(self, max_samples=10000):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, delay_ns):
+        with self._lock:
+            self._samples.append(delay_ns)
+
+    def percentiles(self, points=(50, 95, 99)):
+        """Return {point: delay in ms} plus 'max', or an empty dict without samples."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return {}
+        result = {p: ordered[min(len(ordered) - 1, len(ordered) * p // 100)] / 1e6 for p in points}
+        result['max'] = ordered[-1] / 1e6
+        return result
+
+    def summary(self):
+        """One-line summary such as 'Stamp-to-record delay over 42 events: p50 0.41 ms, ...'."""
+        stats = self.percentiles()
+        if not stats:
+            return "Stamp-to-record delay: no samples"
+        parts = ", ".join(
+            f"{'p' + str(point) if point != 'max' else 'max'} {ms:.2f} ms" for point, ms in stats.items()
+        )
+        return f"Stamp-to-record delay over {len(self)} events: {parts}"
+
+
+def build_hotkey_index(keybinds):
+    """
+    Build the read-only key -> action lookup used by the global key listener.
+
+    The listener sees every keystroke on the system, so the index is built
+    once per change of bindings rather than per key event. Unbound actions
+    (empty key) are left out; if two actions share a key, the later one wins.
+
+    Args:
+        keybinds (dict): action_id -> key name, as stored in keybinds.json.
+
+    Returns:
+        Mapping[str, str]: key name -> action_id.
+    """
+    return MappingProxyType({key: action for action, key in keybinds.items() if key})
+
+
+def hotkey_name(key):
+    """
+    Name of a pynput key as stored in keybinds.json: the Key member name
+    (e.g. 'f7') for special keys, the character for the rest.
+
+    Checks the type instead of probing attributes, so a key costs no
+    AttributeError raised and caught internally.
+    """
+    if isinstance(key, Enum):
+        return key.name  # pynput.keyboard.Key
+    if key is None:
+        return 'unknown'
+    return key.char  # pynput.keyboard.KeyCode; None for keys without a character
+
+
+class HotkeyDispatcher:
+    """
+    Filter global key events down to hotkey actions.
+
+    Shared by the GUI and headless listeners. The listener sees every key
+    typed on the system, so an unbound key costs one type check and one index
+    lookup and allocates nothing. A bound press is stamped with
+    SessionClock.now_ns() before anything can delay its action; holding the
+    key down does not repeat it.
+    """
+
+    def __init__(self, keybinds):
+        self.index = build_hotkey_index(keybinds)
+        self.pressed = set()  # Bound keys currently held down
+
+    def press(self, key):
+        """
+        Handle a key press.
+
+        Returns:
+            tuple: (action_id, at_ns) for a new press of a bound key, or None
+                   for unbound keys and auto-repeat.
+        """
+        key_str = hotkey_name(key)
+        action_id = self.index.get(key_str)
+        if action_id is None:
+            return None  # Unbound key (typing in a game or chat) — nothing to do
+        at_ns = SessionClock.now_ns()
+        if key_str in self.pressed:
+            return None  # Auto-repeat
+        self.pressed.add(key_str)
+        return action_id, at_ns
+
+    def release(self, key):
+        """Handle a key release; returns the bound action_id, or None."""
+        key_str = hotkey_name(key)
+        action_id = self.index.get(key_str)
+        if action_id is None:
+            return None
+        self.pressed.discard(key_str)
+        return action_id
+
+
+class ScreenshotProfile:
+    """
+    How screenshots are encoded: format, compression/quality, downscaling and thumbnails.
+
+    Attributes:
+        format (str): "png", "jpeg" or "webp".
+        png_compress_level (int): zlib level 0-9 for PNG (1 is much faster than PIL's default 6).
+        quality (int): JPEG/WebP quality 1-100.
+        max_width (int): Downscale wider frames to this width; 0 keeps full resolution.
+        thumbnail_width (int): Width of the thumbnail embedded in the log; 0 embeds the full image.
+    """
+    __slots__ = ("format", "png_compress_level", "quality", "max_width", "thumbnail_width")
+
+    EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+    def __init__(self, format="png", png_compress_level=1, quality=85, max_width=0, thumbnail_width=0):
+        self.format = format if format in self.EXTENSIONS else "png"
+        self.png_compress_level = png_compress_level
+        self.quality = quality
+        self.max_width = max_width
+        self.thumbnail_width = thumbnail_width
+
+    @property
+    def extension(self):
+        return self.EXTENSIONS[self.format]
+
+    def save(self, image, path, width=None):
+        """Encode `image` to `path`, downscaling to `width` (or max_width) if it is wider."""
+        from PIL import Image
+
+        width = width or self.max_width
+        if width and image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.BILINEAR)
+        if self.format == "png":
+            image.save(path, "PNG", compress_level=self.png_compress_level)
+        elif self.format == "jpeg":
+            image.convert("RGB").save(path, "JPEG", quality=self.quality)
+        else:
+            image.save(path, "WEBP", quality=self.quality, method=0)
+
+    def save_thumbnail(self, image, path):
+        self.save(image, path, width=self.thumbnail_width)
+
+
+class BurstBuffer:
+    """
+    Rolling in-memory ring of downscaled screen frames.
+
+    While running, a background thread grabs the screen `fps` times a second
+    and keeps the last `seconds` worth of frames, never holding more than
+    `byte_budget` bytes of pixels, so a hotkey can save what happened just
+    before it was pressed.
+    """
+
+    def __init__(self, fps=2, seconds=5, max_width=1280, byte_budget=64 * 1024 * 1024):
+        self.fps = max(0.1, fps)
+        self.seconds = seconds
+        self.max_width = max_width
+        self.byte_budget = byte_budget
+        self._frames = deque()  # (captured_at, image, nbytes), oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stop = None
+
+    @property
+    def running(self):
+        return self._stop is not None and not self._stop.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, args=(self._stop,), daemon=True).start()
+
+    def stop(self):
+        """Stop capturing and drop the buffered frames."""
+        if self._stop:
+            self._stop.set()
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    def snapshot(self):
+        """Return the buffered frames as a list of (captured_at, image), oldest first."""
+        with self._lock:
+            return [(captured_at, image) for captured_at, image, _ in self._frames]
+
+    def _run(self, stop):
+        from PIL import Image, ImageGrab
+
+        interval = 1.0 / self.fps
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                image = ImageGrab.grab(all_screens=False).convert("RGB")
+                if self.max_width and image.width > self.max_width:
+                    height = round(image.height * self.max_width / image.width)
+                    image = image.resize((self.max_width, height), Image.BILINEAR)
+                self._add(started, image)
+            except Exception as e:
+                print(f"Burst capture error: {e}")
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def _add(self, captured_at, image):
+        nbytes = image.width * image.height * len(image.getbands())
+        with self._lock:
+            self._frames.append((captured_at, image, nbytes))
+            self._bytes += nbytes
+            # Evict by age, then by the byte budget (always keeping the newest frame)
+            while self._frames and (
+                captured_at - self._frames[0][0] > self.seconds
+                or (self._bytes > self.byte_budget and len(self._frames) > 1)
+            ):
+                self._bytes -= self._frames.popleft()[2]
+
+
+class ScreenshotSaver:
+    """
+    Encodes and writes captured screenshots on background threads.
+
+    The hotkey handler only grabs the frame and queues it, so PNG encoding and
+    disk writes never hold up the Tk thread. The queue is bounded; when a burst
+    outruns the workers new frames are refused instead of blocking.
+    """
+
+    def __init__(self, workers=2, max_pending=16):
+        self._queue = queue.Queue(maxsize=max_pending)
+        for _ in range(workers):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, image, path, profile, thumbnail_path=None, block=False):
+        """
+        Queue an image to be saved.
+
+        Args:
+            image (PIL.Image.Image): Captured frame.
+            path (str): Destination of the full image.
+            profile (ScreenshotProfile): Encoder settings.
+            thumbnail_path (str, optional): Where to also write a thumbnail.
+            block (bool): Wait for room instead of refusing when the queue is full.
+
+        Returns:
+            bool: True if queued, False if the queue is full.
+        """
+        try:
+            self._queue.put((image, path, profile, thumbnail_path), block=block)
+            return True
+        except queue.Full:
+            return False
+
+    def flush(self):
+        """Block until every queued screenshot is written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            image, path, profile, thumbnail_path = self._queue.get()
+            try:
+                profile.save(image, path)
+                if thumbnail_path:
+                    profile.save_thumbnail(image, thumbnail_path)
+            except Exception as e:
+                print(f"Error saving screenshot: {e}")
+            finally:
+                self._queue.task_done()
+
+
+class TimelineEvent:
+    """
+    A single timeline entry — the source of truth the Markdown log is rendered from.
+
+    Attributes:
+        kind (str): One of the TimelineEvent.* kind constants.
+        elapsed (float): Stopwatch seconds at the moment of the event, or None.
+        counter (int): Timestamp counter for numbered entries, or None.
+        payload (str): Kind-specific text (note, scene name, filename, ...).
+    """
+    __slots__ = ("kind", "elapsed", "counter", "payload")
+
+    START = "start"
+    MARK = "mark"
+    SCREENSHOT = "screenshot"
+    SCREENSHOT_THUMB = "screenshot_thumb"  # Thumbnail embed linking to the full image
+    BURST = "burst"  # Payload: space-separated frame filenames
+    SCENE = "scene"
+    SHORT = "short"
+    SHORT_ERROR = "short_error"
+    VOICE = "voice"
+    LATE_VOICE = "late_voice"  # Voice note that finished after other entries were written
+    STOP = "stop"
+
+    # Markdown written to the session file for each kind
+    _MARKDOWN = {
+        START: "\n## 0 - Filename: {payload}\n\n* **Starting Notes** - \n",
+        MARK: "\n*  **[{counter}]**   **{time}** - {payload}",
+        SCREENSHOT: "\n*  **[{counter}]**   **{time}** - 📸 Screenshot → ![Screenshot](Screenshots/{payload})",
+        SCREENSHOT_THUMB: (
+            "\n*  **[{counter}]**   **{time}** - 📸 Screenshot → "
+            "[![Screenshot](Screenshots/thumbs/{payload})](Screenshots/{payload})"
+        ),
+        BURST: "\n*  **[{counter}]**   **{time}** - 🎞️ Burst → {links}",
+        SCENE: "\n📺  **Scene →** {payload}",
+        SHORT: "\n\n## SHORT - {payload} - \n",
+        SHORT_ERROR: "\n\n## ERROR - NO REPLAY BUFFER RUNNING \n",
+        VOICE: " **Voice Note:** {payload}\n",
+        LATE_VOICE: "\n*  **[{counter}]**   **{time}** - **Voice Note:** {payload}",
+        STOP: "\n\n* **Ending Notes** - \nTotal Recording Time: {time}\n\n---\n",
+    }
+    # Compact text for the HUD feed; kinds without an entry are not shown
+    _DISPLAY = {
+        MARK: "*  [{counter}]   {time} - {payload}",
+        SCREENSHOT: "*  [{counter}]   {time} - 📸 Screenshot",
+        SCREENSHOT_THUMB: "*  [{counter}]   {time} - 📸 Screenshot",
+        BURST: "*  [{counter}]   {time} - 🎞️ Burst",
+        SCENE: "📺 {payload}",
+        SHORT: "## SHORT - {payload} -",
+        SHORT_ERROR: "## ERROR - NO REPLAY BUFFER RUNNING",
+        VOICE: "Voice Note: {payload}",
+        LATE_VOICE: "*  [{counter}]   {time} - Voice Note: {payload}",
+    }
+
+    def __init__(self, kind, elapsed=None, counter=None, payload=""):
+        self.kind = kind
+        self.elapsed = elapsed
+        self.counter = counter
+        self.payload = payload
+
+    def render(self, time_format=format_elapsed):
+        """Render the event as the Markdown chunk appended to the session file."""
+        links = ""
+        if self.kind == self.BURST:
+            links = " ".join(f"![Burst](Screenshots/{name})" for name in self.payload.split())
+        return self._MARKDOWN[self.kind].format(
+            counter=self.counter, time=time_format(self.elapsed), payload=self.payload, links=links
+        )
+
+    def display(self, time_format=format_elapsed):
+        """Return the HUD line for this event, or None if it is not shown."""
+        template = self._DISPLAY.get(self.kind)
+        if template is None:
+            return None
+        return template.format(
+            counter=self.counter, time=time_format(self.elapsed), payload=self.payload
+        ).strip()
+
+
+class SessionLog:
+    """
+    Write-ahead event log kept next to a session file, as `<file>.events.jsonl`.
+
+    Every TimelineEvent is queued here before its Markdown, on the same
+    SessionWriter, so the log is never behind the file. Each record also
+    carries the running counter and the wall-clock time the stopwatch started
+    (None once stopped), which makes the last record alone enough to resume a
+    session: recovery reads the file backwards and stops after a line or two,
+    however many events the session has.
+
+    Record fields: k kind, e elapsed seconds, c counter, p payload,
+    n running counter, s stopwatch start (wall-clock ns) or null.
+    """
+
+    SUFFIX = ".events.jsonl"
+
+    def __init__(self, session_path, writer):
+        self.path = session_path + self.SUFFIX
+        self.writer = writer
+
+    def append(self, event, counter, start_wall_ns):
+        """Queue one event record."""
+        record = {
+            "k": event.kind, "e": event.elapsed, "c": event.counter, "p": event.payload,
+            "n": counter, "s": start_wall_ns,
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self.writer.append(self.path, line.encode("utf-8"))
+
+    def recover(self):
+        """
+        Read the session state left by the last run.
+
+        Returns:
+            tuple: (start_wall_ns, counter, events). `start_wall_ns` is None if the
+                   stopwatch was not running; `events` holds the entries since the
+                   latest numbered one, enough to attach late voice notes.
+        """
+        records = []
+        try:
+            for record in self._parse(read_lines_backwards(self.path)):
+                records.append(record)
+                if record["c"] is not None or record["k"] in (TimelineEvent.START, TimelineEvent.STOP):
+                    break
+        except OSError:
+            return None, 0, []
+        if not records or records[0]["s"] is None:
+            return None, 0, []
+        events = [TimelineEvent(r["k"], r["e"], r["c"], r["p"]) for r in reversed(records)]
+        return records[0]["s"], records[0]["n"], events
+
+    def records(self):
+        """Yield every record as a dict, oldest first; nothing if there is no log."""
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as log:
+                yield from self._parse(log)
+        except OSError:
+            return
+
+    @staticmethod
+    def _parse(lines):
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # Blank line, or a record cut off by a crash
+
+
+class TranscriptionJob:
+    """A recorded voice note waiting for transcription, tied to the mark it was recorded at."""
+    __slots__ = ("audio", "counter", "elapsed")
+
+    def __init__(self, audio, counter, elapsed):
+        self.audio = audio
+        self.counter = counter
+        self.elapsed = elapsed
+
+
+class TranscriptionQueue:
+    """
+    Bounded queue of voice notes processed by a pool of worker threads.
+
+    Recording never waits for transcription: jobs are queued and `handler` is
+    called for each one on a worker thread. `depth` counts queued and running
+    jobs so the HUD can show how far behind transcription is.
+    """
+
+    def __init__(self, handler, max_pending=8, workers=1):
+        self._handler = handler
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._worker_count = 0  # Workers wanted
+        self._retiring = 0  # Workers still to exit after a shrink
+        self.set_workers(workers)
+
+    @property
+    def depth(self):
+        return self._depth
+
+    def set_workers(self, count):
+        """Grow or shrink the worker pool to `count` threads (at least one)."""
+        count = max(1, int(count))
+        with self._lock:
+            change = count - self._worker_count
+            self._worker_count = count
+            if change > 0:
+                # Workers that were about to retire can simply stay
+                kept = min(change, self._retiring)
+                self._retiring -= kept
+                for _ in range(change - kept):
+                    threading.Thread(target=self._run, daemon=True).start()
+            else:
+                # Whichever workers look next retire; none starts another job until they have
+                self._retiring -= change
+        for _ in range(-change):
+            try:
+                self._queue.put_nowait(None)  # Wake an idle worker so it can exit
+            except queue.Full:
+                break  # Every worker is busy and checks before taking its next job
+
+    def submit(self, job):
+        """
+        Queue a job for transcription.
+
+        Returns:
+            bool: True if queued, False if the queue is full.
+        """
+        with self._lock:
+            self._depth += 1
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._depth -= 1
+            return False
+
+    def _retire(self):
+        """Take one pending retirement, if any; True means this worker must exit."""
+        with self._lock:
+            if self._retiring:
+                self._retiring -= 1
+                return True
+            return False
+
+    def _run(self):
+        while not self._retire():
+            job = self._queue.get()
+            if job is None:
+                continue
+            if self._retire():
+                # The pool shrank while this worker waited; hand the job to one that stays
+                self._queue.put(job)
+                return
+            try:
+                self._handler(job)
+            except Exception as e:
+                print(f"Transcription worker error: {e}")
+            finally:
+                with self._lock:
+                    self._depth -= 1
+
+
+def merge_transcripts(parts, max_overlap_words=8):
+    """
+    Join transcripts of overlapping audio windows, dropping words repeated across a seam.
+
+    Args:
+        parts (list[str]): Transcripts in recording order.
+        max_overlap_words (int): Longest repeated run of words looked for at each seam.
+
+    Returns:
+        str: The merged transcript.
+    """
+    def norm(word):
+        return word.strip(".,!?;:\"'").lower()
+
+    words = []
+    for part in parts:
+        new_words = part.split()
+        if not new_words:
+            continue
+        tail = [norm(w) for w in words[-max_overlap_words:]]
+        head = [norm(w) for w in new_words[:max_overlap_words]]
+        overlap = 0
+        for size in range(min(len(tail), len(head)), 0, -1):
+            if tail[-size:] == head[:size]:
+                overlap = size
+                break
+        words.extend(new_words[overlap:])
+    return " ".join(words)
+
+
+class AudioCaptureBuffer:
+    """
+    Preallocated mono float32 buffer that audio callbacks copy into in place.
+
+    Sized for the longest allowed capture, so recording never grows a list of
+    chunk copies and the captured audio can be handed to Whisper as a view
+    without concatenating. The memory is left uninitialised, so physical pages
+    are only touched as audio is written into them.
+    """
+
+    def __init__(self, max_seconds, fs=16000):
+        import numpy as np
+        self.fs = fs
+        self.capacity = int(max_seconds * fs)
+        # (frames, 1) layout matches sounddevice; `samples` is the same memory as 1-D
+        self.frames = np.empty((self.capacity, 1), dtype=np.float32)
+        self.samples = self.frames.reshape(-1)
+        self.length = 0
+
+    @property
+    def full(self):
+        return self.length >= self.capacity
+
+    def write(self, indata):
+        """
+        Copy a (frames, 1) block from an input callback into the buffer.
+
+        Returns:
+            int: Number of frames stored (fewer than given once the buffer is full).
+        """
+        count = min(len(indata), self.capacity - self.length)
+        if count > 0:
+            self.frames[self.length:self.length + count] = indata[:count]
+            self.length += count
+        return count
+
+    def view(self, start=0, end=None):
+        """Return samples [start, end) of the captured audio as a 1-D view (no copy)."""
+        if end is None or end > self.length:
+            end = self.length
+        return self.samples[start:end]
+
+
+# Voice activity detection — frame energies below this RMS never count as speech
+MIN_SPEECH_RMS = 0.01
+
+
+def detect_speech(samples, fs=16000, frame_ms=30, pad_ms=250, min_rms=MIN_SPEECH_RMS, ratio=3.0, edge_ms=150):
+    """
+    Find the span of a recording that contains speech, using frame energy.
+
+    The noise floor is measured on the first and last `edge_ms` (the moment
+    before speaking and after), not on the quietest frames of the whole clip,
+    so steady speech or speech over game audio is not mistaken for noise.
+    A frame counts as speech when its RMS exceeds both `min_rms` and `ratio`
+    times that floor. If nothing clears the ratio test but the recording is
+    not silent, the whole recording is returned: trimming is only an
+    optimisation, and a note must never be dropped because of it.
+
+    Args:
+        samples (np.ndarray): Mono float32 audio.
+        fs (int): Sample rate.
+        frame_ms (int): Analysis frame length.
+        pad_ms (int): Audio kept either side of the detected speech.
+        edge_ms (int): Length of the leading/trailing stretch used as the noise sample.
+
+    Returns:
+        tuple: (start, end) sample indices, or None if the recording is silent
+               (no frame reaches `min_rms`).
+    """
+    import numpy as np
+
+    frame = int(fs * frame_ms / 1000)
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    frames = samples[:count * frame].reshape(count, frame)
+    energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    if float(energy.max()) <= min_rms:
+        return None
+    edge = max(1, min(count // 4, int(edge_ms / frame_ms)))
+    noise_floor = min(float(np.median(energy[:edge])), float(np.median(energy[-edge:])))
+    voiced = np.flatnonzero(energy > max(min_rms, noise_floor * ratio))
+    if voiced.size == 0:
+        return 0, len(samples)  # Speech from start to end, or over steady background audio
+    pad = int(fs * pad_ms / 1000)
+    start = max(0, int(voiced[0]) * frame - pad)
+    end = min(len(samples), (int(voiced[-1]) + 1) * frame + pad)
+    return start, end
+
+
+class SpeechEndpointer:
+    """
+    Streaming end-of-speech detector for fixed-length captures.
+
+    Fed block by block from an audio callback; reports the end of speech once
+    the user has spoken and then been quiet for `hangover_seconds`.
+    """
+
+    def __init__(self, fs=16000, hangover_seconds=1.0, min_rms=MIN_SPEECH_RMS, ratio=3.0):
+        self.hangover = int(hangover_seconds * fs)
+        self.min_rms = min_rms
+        self.ratio = ratio
+        self.noise_floor = None
+        self.speech_seen = False
+        self.silence = 0
+
+    def update(self, block):
+        """
+        Process one block of samples.
+
+        Returns:
+            bool: True once speech has started and then stopped.
+        """
+        import numpy as np
+
+        rms = float(np.sqrt(np.mean(np.square(block, dtype=np.float32))))
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        if rms > max(self.min_rms, self.noise_floor * self.ratio):
+            self.speech_seen = True
+            self.silence = 0
+        else:
+            # Track the background level from non-speech blocks only
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+            if self.speech_seen:
+                self.silence += len(block)
+        return self.speech_seen and self.silence >= self.hangover
+
+
+class StreamingTranscriber:
+    """
+    Transcribes a recording in overlapping windows while it is still being captured.
+
+    The capture loop calls `feed()` with the number of samples recorded so far;
+    every time a full window is available it is handed to a background thread.
+    `finish()` only has to transcribe the audio after the last full window, so
+    the text is ready roughly one window after the user stops talking.
+    """
+
+    def __init__(self, transcribe, fs=16000, window_seconds=8.0, overlap_seconds=1.0):
+        self._transcribe = transcribe
+        self.window = int(window_seconds * fs)
+        self.overlap = min(int(overlap_seconds * fs), self.window // 2)
+        self.step = self.window - self.overlap
+        self.next_start = 0
+        self.parts = []
+        self.error = None
+        self._windows = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def feed(self, available, read):
+        """
+        Queue every complete window.
+
+        Args:
+            available (int): Samples captured so far.
+            read (callable): read(start, end) -> 1-D float32 samples.
+        """
+        while self.next_start + self.window <= available:
+            self._windows.put(read(self.next_start, self.next_start + self.window))
+            self.next_start += self.step
+
+    def finish(self, available, read):
+        """
+        Transcribe what is left and wait for all windows.
+
+        Returns:
+            str: The merged transcript.
+
+        Raises:
+            Exception: The first error raised while transcribing a window.
+        """
+        # Audio past the part already covered by the last queued window
+        covered = self.next_start + self.overlap if self.next_start else 0
+        if available > covered:
+            self._windows.put(read(self.next_start, available))
+        self._windows.put(None)
+        self._thread.join()
+        if self.error:
+            raise self.error
+        return merge_transcripts(self.parts)
+
+    def cancel(self):
+        """Stop the background thread without transcribing anything further."""
+        self.error = self.error or RuntimeError("cancelled")
+        self._windows.put(None)
+
+    def _run(self):
+        while True:
+            audio = self._windows.get()
+            if audio is None:
+                return
+            if self.error:
+                continue
+            try:
+                self.parts.append(self._transcribe(audio))
+            except Exception as e:
+                self.error = e
+
+
+class WhisperModel:
+    """
+    Whisper model that is only loaded when a voice note needs it.
+
+    Importing whisper pulls in torch and the model itself takes hundreds of MB,
+    so nothing is loaded at startup. After `idle_unload_seconds` without a
+    transcription the model is dropped again to give the memory back.
+    """
+
+    MODEL_SIZES = ("tiny", "base", "small")
+
+    def __init__(self, size="base", idle_unload_seconds=600):
+        self.size = size
+        self.idle_unload_seconds = idle_unload_seconds
+        self._model = None
+        self._load_lock = threading.Lock()
+        # Whisper's decoder installs hooks on the model, so transcriptions must not overlap
+        self._use_lock = threading.Lock()
+        self._idle_timer = None
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def configure(self, size=None, idle_unload_seconds=None):
+        """Change model size / idle timeout; a loaded model of another size is dropped."""
+        if idle_unload_seconds is not None:
+            self.idle_unload_seconds = idle_unload_seconds
+        if size and size != self.size:
+            self.size = size
+            self.unload()
+
+    def get(self):
+        """
+        Return the model, loading it on first use (blocking).
+
+        Raises:
+            Exception: If whisper is not installed or the model fails to load.
+        """
+        with self._load_lock:
+            if self._model is None:
+                import whisper
+                self._model = whisper.load_model(self.size)
+                print(f"Whisper model '{self.size}' loaded.")
+            self._schedule_unload()
+            return self._model
+
+    def prewarm(self):
+        """Load the model in the background so the first voice note starts quickly."""
+        def load():
+            try:
+                self.get()
+            except Exception as e:
+                print(f"Error loading whisper: {e}")
+        threading.Thread(target=load, daemon=True).start()
+
+    def transcribe(self, audio):
+        """
+        Transcribe a mono 16 kHz float32 array.
+
+        Returns:
+            str: The stripped transcription text.
+        """
+        with self._use_lock:
+            result = self.get().transcribe(audio, fp16=False)
+            self._schedule_unload()
+        return result['text'].strip()
+
+    def unload(self):
+        """Drop the model so its memory can be reclaimed."""
+        with self._load_lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._model is not None:
+                self._model = None
+                import gc
+                gc.collect()
+                print("Whisper model unloaded.")
+
+    def _schedule_unload(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self.idle_unload_seconds:
+            self._idle_timer = threading.Timer(self.idle_unload_seconds, self._unload_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _unload_if_idle(self):
+        # Never pull the model out from under a running transcription
+        if self._use_lock.acquire(blocking=False):
+            try:
+                self.unload()
+            finally:
+                self._use_lock.release()
+        else:
+            with self._load_lock:
+                self._schedule_unload()
+
 
 class TimestampManager:
+    RECENT_EVENTS_MAX = 20  # HUD lines kept in memory
+    RESUME_MAX_AGE_S = 24 * 3600  # Older running logs are a forgotten crash, not a session to continue
+
     def __init__(self, base_path=None):
         """Initialize the timestamp manager."""
         self.stopwatch_running = False
-        self.start_time = None
+        self.clock = SessionClock()
+        self.time_format = format_elapsed
+        # Stamp -> event recorded delay, for every event stamped with an at_ns
+        self.stamp_latency = LatencyStats()
         self.current_file_path = None
+        self.journal = None  # SessionJournal for the current file
+        self.session_log = None  # SessionLog (write-ahead event log) for the current file
+        self._start_wall_ns = None  # Wall-clock time the stopwatch started, for resuming after a restart
+        self.events = []  # TimelineEvent records written to the current file
+        self.recent_events = deque(maxlen=self.RECENT_EVENTS_MAX)  # HUD lines, newest last
+        self._lock = threading.RLock()  # Guards counter/events across GUI, OBS and worker threads
+        self.writer = SessionWriter()  # Owns all session file writes
+        self.screenshots = ScreenshotSaver()  # Encodes/saves screenshots off the Tk thread
+        self.screenshot_profile = ScreenshotProfile()
+        self.burst = None  # BurstBuffer when the pre-capture mode is enabled
         self.counter = 0  # Initialize counter for timestamps
         self.base_path = base_path or os.getcwd()
         # Default output directory; can be overridden via set_output_dir()
         self.output_dir = os.path.join(self.base_path, "Timestamp_TXT")
 
-        self.whisper_model = None
-        self.is_transcribing = False
+        self.whisper = WhisperModel()  # Loaded on first voice note
+        self.whisper_prewarm = False  # Load the model as soon as a recording starts
+        self.ptt_streaming = False  # Transcribe PTT audio while the key is still held
+        self.ptt_window_seconds = 8
+        self.is_voice_recording = False  # 10s clip capture in progress
+        self.transcriptions = TranscriptionQueue(self._transcribe_job)
         self.gui_callback = None
         self.mic_device_index = None  # None = system default
-        
-        # Load whisper in background to avoid freezing the app
-        import threading
-        threading.Thread(target=self._load_whisper_model, daemon=True).start()
 
-    def _load_whisper_model(self):
-        try:
-            import whisper
-            self.whisper_model = whisper.load_model("base")
-            print("Whisper model loaded.")
-        except Exception as e:
-            print(f"Error loading whisper: {e}")
+    def close(self):
+        """Flush pending screenshots and session writes; call before the app exits."""
+        self.screenshots.flush()
+        self.writer.close()
 
     def register_gui_callback(self, callback):
         self.gui_callback = callback
@@ -42,6 +1324,135 @@ class TimestampManager:
         """Set the microphone device index for voice recordings. None = system default."""
         self.mic_device_index = device_index
 
+    def set_whisper_options(self, model_size="base", idle_unload_seconds=600, prewarm=False, workers=1,
+                            ptt_streaming=False, ptt_window_seconds=8):
+        """
+        Configure voice transcription.
+
+        Args:
+            model_size (str): Whisper model size, one of WhisperModel.MODEL_SIZES.
+            idle_unload_seconds (int): Unload the model after this long unused; 0 keeps it loaded.
+            prewarm (bool): If True, load the model when a recording starts instead of on first use.
+            workers (int): Number of transcription worker threads.
+            ptt_streaming (bool): Transcribe push-to-talk memos in windows while still recording.
+            ptt_window_seconds (int): Length of each streaming window.
+        """
+        if model_size not in WhisperModel.MODEL_SIZES:
+            model_size = "base"
+        self.whisper.configure(model_size, idle_unload_seconds)
+        self.whisper_prewarm = prewarm
+        self.transcriptions.set_workers(workers)
+        self.ptt_streaming = ptt_streaming
+        self.ptt_window_seconds = ptt_window_seconds
+
+    def set_screenshot_profile(self, **settings):
+        """
+        Configure screenshot encoding.
+
+        Args:
+            **settings: ScreenshotProfile fields (format, png_compress_level, quality,
+                        max_width, thumbnail_width).
+        """
+        self.screenshot_profile = ScreenshotProfile(**settings)
+
+    def set_burst_options(self, enabled=False, fps=2, seconds=5, max_width=1280, budget_mb=64):
+        """
+        Configure the rolling pre-capture buffer used by save_burst().
+
+        Args:
+            enabled (bool): Keep capturing frames while the stopwatch runs (off by default).
+            fps (float): Frames captured per second.
+            seconds (float): How far back the buffer reaches.
+            max_width (int): Frames are downscaled to this width.
+            budget_mb (int): Upper bound on buffered pixel memory.
+        """
+        if self.burst:
+            self.burst.stop()
+            self.burst = None
+        if enabled:
+            self.burst = BurstBuffer(fps, seconds, max_width, budget_mb * 1024 * 1024)
+            if self.stopwatch_running:
+                self.burst.start()
+
+    def _ensure_whisper_model(self):
+        """
+        Load the Whisper model if needed, reporting progress to the GUI.
+
+        Returns:
+            bool: True if the model is ready, False if it failed to load.
+        """
+        if self.whisper.loaded:
+            return True
+        if self.gui_callback:
+            self.gui_callback("Model Loading...")
+        try:
+            self.whisper.get()
+            return True
+        except Exception as e:
+            print(f"Error loading whisper: {e}")
+            if self.gui_callback:
+                self.gui_callback("Model Error")
+            return False
+
+    def set_time_format(self, style="seconds", fps=60):
+        """
+        Choose how stopwatch times are written.
+
+        Args:
+            style (str): One of ElapsedFormat.STYLES.
+            fps (int): Frame rate for the "frames" style.
+        """
+        self.time_format = ElapsedFormat(style, fps)
+
+    def _elapsed_seconds(self, at_ns=None):
+        if self.stopwatch_running:
+            return self.clock.elapsed(at_ns)
+        return None
+
+    def _record_event(self, kind, payload="", numbered=False, counter=None, elapsed=None, at_ns=None):
+        """
+        Store a new timeline event and append its rendered Markdown to the file.
+
+        Args:
+            kind (str): TimelineEvent kind.
+            payload (str): Kind-specific text.
+            numbered (bool): If True, the event takes the next counter value.
+            counter (int, optional): Explicit counter for events that refer to an earlier mark.
+            elapsed (float, optional): Explicit stopwatch seconds.
+            at_ns (int, optional): SessionClock.now_ns() captured when the event happened;
+                                   used when `elapsed` is not given. Defaults to now.
+
+        Returns:
+            TimelineEvent: The recorded event.
+        """
+        with self._lock:
+            if numbered:
+                self.counter += 1  # Increment counter on each timestamp
+                counter = self.counter
+            if at_ns is not None:
+                self.stamp_latency.add(self.clock.now_ns() - at_ns)
+            if elapsed is None:
+                elapsed = self._elapsed_seconds(at_ns)
+            event = TimelineEvent(kind, elapsed, counter, payload)
+            self.events.append(event)
+            running = kind == TimelineEvent.START or (self.stopwatch_running and kind != TimelineEvent.STOP)
+            self.session_log.append(event, self.counter, self._start_wall_ns if running else None)
+            self.journal.append(event.render(self.time_format))
+            line = event.display(self.time_format)
+            if line:
+                self.recent_events.append(line)
+            return event
+
+    def _seed_recent_events(self):
+        """Fill the HUD feed from the end of an opened file without reading all of it."""
+        from timestamp_parser import tail_display_lines  # The parser builds on this module
+
+        self.recent_events.clear()
+        try:
+            self.recent_events.extend(tail_display_lines(self.current_file_path, self.recent_events.maxlen))
+        except OSError:
+            pass
+
     def create_file(self, initial_dir=None):
         """
         Create a new file with a timestamped name.
@@ -64,7 +1475,7 @@ class TimestampManager:
             os.makedirs(target_dir)
 
         # Generate default filename with current timestamp
-        default_name = datetime.now().strftime("[%d-%m-%Y][%H-%M-%S] - WRITE HERE.md")
+        default_name = self.default_file_name()
         
         # Open file dialog
         file_name = filedialog.asksaveasfilename(
@@ -77,43 +1488,107 @@ class TimestampManager:
 
         # If a file was selected, create it and return the path
         if file_name:
-            self.current_file_path = file_name
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                file.write("")  # Ensure the file exists
-            return self.current_file_path
+            return self.open_file(file_name)
         return None
 
-    def start_recording(self):
+    @staticmethod
+    def default_file_name():
+        """Name for a new session file, based on the current date and time."""
+        return datetime.now().strftime("[%d-%m-%Y][%H-%M-%S] - WRITE HERE.md")
+
+    def open_file(self, file_path, resume=False):
+        """
+        Make `file_path` the current session file, without any dialog.
+
+        The file is created if it does not exist; new entries are appended to
+        an existing one.
+
+        Args:
+            file_path (str): Path of the session file.
+            resume (bool): If its event log shows the stopwatch was still running
+                (the app closed or crashed mid-recording), resume the session with
+                the same counter and elapsed time. Only startup recovery asks for this.
+
+        Returns:
+            str: The path of the now-current file.
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.current_file_path = file_path
+        self.journal = SessionJournal(file_path, self.writer)
+        self.session_log = SessionLog(file_path, self.writer)
+        self.events = []
+        self._seed_recent_events()
+        if resume and not self.stopwatch_running:
+            self._resume_from_log()
+        return self.current_file_path
+
+    @staticmethod
+    def was_recording(file_path):
+        """True if the event log of `file_path` ends with the stopwatch running."""
+        start_wall_ns, _, _ = SessionLog(file_path, None).recover()
+        return start_wall_ns is not None
+
+    def _resume_from_log(self):
+        """Restore a running stopwatch from the current file's event log, unless it has none or is stale."""
+        start_wall_ns, counter, events = self.session_log.recover()
+        if start_wall_ns is None:
+            return False
+        age_s = (time.time_ns() - start_wall_ns) / 1e9
+        if age_s > self.RESUME_MAX_AGE_S:
+            print(f"Not resuming {self.current_file_path}: its stopwatch started {age_s / 3600:.0f} h ago.")
+            return False
+        with self._lock:
+            self.counter = counter
+            self.events = events
+            self._start_wall_ns = start_wall_ns
+            # The monotonic clock restarts with the process; carry the elapsed time over via the wall clock
+            elapsed_ns = max(0, time.time_ns() - start_wall_ns)
+            self.clock.start(self.clock.now_ns() - elapsed_ns)
+            self.stopwatch_running = True
+        if self.burst:
+            self.burst.start()
+        return True
+
+    def start_recording(self, at_ns=None):
         """
         Start recording by adding a timestamp to the file.
+
+        Args:
+            at_ns (int, optional): SessionClock.now_ns() when the start was requested.
         
         Returns:
             bool: True if recording started successfully, False otherwise.
         """
         if self.current_file_path and not self.stopwatch_running:
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                timestamp = datetime.now().strftime("[%d-%m][%H-%M-%S]")
-                self.counter = 0  # Reset counter on start
-                file.write(f"\n## 0 - Filename: {timestamp}\n\n* **Starting Notes** - \n")
-            self.start_time = time.time()
+            at_ns = at_ns if at_ns is not None else self.clock.now_ns()
+            timestamp = datetime.now().strftime("[%d-%m][%H-%M-%S]")
+            self.counter = 0  # Reset counter on start
+            self._start_wall_ns = time.time_ns() - (self.clock.now_ns() - at_ns)
+            self._record_event(TimelineEvent.START, timestamp)
+            self.clock.start(at_ns)
             self.stopwatch_running = True
+            if self.whisper_prewarm:
+                self.whisper.prewarm()
+            if self.burst:
+                self.burst.start()
             return True
         return False
 
-    def mark_time(self):
+    def mark_time(self, at_ns=None):
         """
         Mark the current stopwatch time in the file.
+
+        Args:
+            at_ns (int, optional): SessionClock.now_ns() when the mark was requested.
         
         Returns:
             str: Formatted time if marked successfully, None otherwise.
         """
         if self.current_file_path and self.stopwatch_running:
-            elapsed_time = time.time() - self.start_time
-            formatted_time = time.strftime("[%H:%M:%S]", time.gmtime(elapsed_time))
-            self.counter += 1  # Increment counter on each timestamp
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                file.write(f"\n*  **[{self.counter}]**   **{formatted_time}** - ")
-            return formatted_time
+            event = self._record_event(TimelineEvent.MARK, numbered=True, at_ns=at_ns)
+            return self.time_format(event.elapsed)
         return None
 
     def get_elapsed_time(self):
@@ -121,90 +1596,129 @@ class TimestampManager:
         Get the current elapsed time as a formatted string.
         
         Returns:
-            str: Formatted time 'HH:MM:SS' if recording, None otherwise.
+            str: Formatted time (see set_time_format) if recording, None otherwise.
         """
-        if self.stopwatch_running and self.start_time:
-            elapsed_time = time.time() - self.start_time
-            return time.strftime("[%H:%M:%S]", time.gmtime(elapsed_time))
+        if self.stopwatch_running:
+            return self.time_format(self._elapsed_seconds())
         return None
 
-    def mark_custom_note(self, note_text: str):
+    def mark_custom_note(self, note_text: str, at_ns=None):
         """
         Mark the current stopwatch time with a custom text note.
         
         Args:
             note_text (str): The custom text to append after the timestamp.
+            at_ns (int, optional): SessionClock.now_ns() when the mark was requested.
             
         Returns:
             str: Formatted time if marked successfully, None otherwise.
         """
         if self.current_file_path and self.stopwatch_running:
-            elapsed_time = time.time() - self.start_time
-            formatted_time = time.strftime("[%H:%M:%S]", time.gmtime(elapsed_time))
-            self.counter += 1  # Increment counter on each timestamp
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                file.write(f"\n*  **[{self.counter}]**   **{formatted_time}** - {note_text}")
-            return formatted_time
+            event = self._record_event(TimelineEvent.MARK, note_text, numbered=True, at_ns=at_ns)
+            return self.time_format(event.elapsed)
         return None
 
-    def stop_recording(self):
+    def stop_recording(self, at_ns=None):
         """
         Stop and reset the stopwatch.
+
+        Args:
+            at_ns (int, optional): SessionClock.now_ns() when the stop was requested.
         
         Returns:
             bool: True if recording stopped successfully, False otherwise.
         """
         if self.current_file_path and self.stopwatch_running:
-            elapsed_time = self.get_elapsed_time()
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                file.write(f"\n\n* **Ending Notes** - ")
-                file.write(f"\nTotal Recording Time: {elapsed_time}\n")
-                file.write("\n---\n")
+            self._record_event(TimelineEvent.STOP, at_ns=at_ns)
+            if self.burst:
+                self.burst.stop()
             self.stopwatch_running = False
-            self.start_time = None
+            self.clock.stop()
             self.counter = 0  # Reset counter on stop
             return True
         return False
 
-    def save_short(self, error=False):
+    def save_short(self, error=False, at_ns=None):
         """
         Take a short and add it to the current file.
         
         Args:
             error (bool): If True, writes an error marker instead of standard short.
+            at_ns (int, optional): SessionClock.now_ns() when the short was requested.
             
         Returns:
-            bool: True if short was saved successfully, False otherwise.
+            str: Formatted time of the short (True while the stopwatch is stopped),
+                 False if no file is open.
         """
         if self.current_file_path:
-            with open(self.current_file_path, "a", encoding="utf-8") as file:
-                timestamp = datetime.now().strftime("[%d-%m][%H-%M-%S]")
-                if error:
-                    file.write(f"\n\n## ERROR - NO REPLAY BUFFER RUNNING \n")
+            timestamp = datetime.now().strftime("[%d-%m][%H-%M-%S]")
+            if error:
+                event = self._record_event(TimelineEvent.SHORT_ERROR, at_ns=at_ns)
+            else:
+                event = self._record_event(TimelineEvent.SHORT, timestamp, at_ns=at_ns)
+            return self.time_format(event.elapsed) or True
+        return False
+
+    def mark_scene(self, scene_name: str, at_ns=None):
+        """
+        Write an OBS scene transition marker to the log.
+
+        Args:
+            scene_name (str): Name of the scene that became active.
+            at_ns (int, optional): SessionClock.now_ns() when the switch was reported.
+
+        Returns:
+            bool: True if the marker was written, False otherwise.
+        """
+        if self.current_file_path and self.stopwatch_running:
+            self._record_event(TimelineEvent.SCENE, scene_name, at_ns=at_ns)
+            return True
+        return False
+
+    def append_voice_note(self, transcription: str, counter=None, elapsed=None):
+        """
+        Append a finished voice note transcription to the log.
+
+        If the mark it was recorded at is still the last entry the note goes on
+        the same line; otherwise it gets its own line carrying that mark's
+        counter and time.
+
+        Args:
+            transcription (str): Transcribed text.
+            counter (int, optional): Counter of the mark the note belongs to.
+            elapsed (float, optional): Stopwatch seconds of that mark.
+
+        Returns:
+            bool: True if the note was written, False otherwise.
+        """
+        if self.current_file_path and transcription:
+            with self._lock:
+                last = self.events[-1] if self.events else None
+                if counter is None or (last and last.kind == TimelineEvent.MARK and last.counter == counter):
+                    self._record_event(TimelineEvent.VOICE, transcription)
                 else:
-                    file.write(f"\n\n## SHORT - {timestamp} - \n")
+                    self._record_event(TimelineEvent.LATE_VOICE, transcription, counter=counter, elapsed=elapsed)
             return True
         return False
 
-    def save_changes(self, text_content):
+    def save_changes(self, text_content, base_version=None):
         """
-        Save changes to the current file.
+        Save user edits to the current file.
+
+        Only the changed tail is rewritten; events appended since `base_version`
+        are preserved after the edited text.
         
         Args:
-            text_content (str): Content to be saved to the file.
+            text_content (str): Edited content from the text viewer, without the
+                newline Tkinter adds after the last line (read it up to "end-1c").
+            base_version (int, optional): Journal version the edits were made against.
         
         Returns:
-            bool: True if changes were saved successfully, False otherwise.
+            int: Journal version containing the edits, or None if no file is open.
         """
         if self.current_file_path:
-            with open(self.current_file_path, "w", encoding="utf-8") as file:
-                # Remove only the very last newline that Tkinter adds automatically, 
-                # but keep all other trailing whitespace/spaces.
-                if text_content.endswith('\n'):
-                    text_content = text_content[:-1]
-                file.write(text_content)
-            return True
-        return False
+            return self.journal.commit_edits(text_content, base_version)
+        return None
 
     def read_file_content(self):
         """
@@ -213,84 +1727,116 @@ class TimestampManager:
         Returns:
             str: File contents if file exists, empty string otherwise.
         """
-        if self.current_file_path:
-            try:
-                with open(self.current_file_path, "r", encoding="utf-8") as file:
-                    return file.read()
-            except FileNotFoundError:
-                return ""
+        if self.journal:
+            return self.journal.text
         return ""
 
-    def take_screenshot(self) -> bool:
+    def take_screenshot(self, at_ns=None):
         """
         Captures the screen and links it as a markdown image in the timestamp log.
-        Returns True if successful.
+        The log line is written as soon as the frame is captured; encoding and
+        saving the image happen in the background. `at_ns` is the
+        SessionClock.now_ns() of the request (defaults to now, before the grab).
+        Returns the formatted time of the screenshot, or False if none was taken.
         """
         if not self.stopwatch_running or not self.current_file_path:
             return False
+        at_ns = at_ns if at_ns is not None else self.clock.now_ns()
 
         try:
-            import os
             from PIL import ImageGrab
-            from datetime import datetime
             
             screenshots_dir = os.path.join(self.output_dir, "Screenshots")
             os.makedirs(screenshots_dir, exist_ok=True)
             
-            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"shot_{timestamp_str}.png"
+            profile = self.screenshot_profile
+            # Milliseconds keep burst captures from overwriting each other
+            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            filename = f"shot_{timestamp_str}{profile.extension}"
             filepath = os.path.join(screenshots_dir, filename)
+            thumbnail_path = None
+            if profile.thumbnail_width:
+                thumbs_dir = os.path.join(screenshots_dir, "thumbs")
+                os.makedirs(thumbs_dir, exist_ok=True)
+                thumbnail_path = os.path.join(thumbs_dir, filename)
             
             # Use default capture (Primary Monitor Only)
             img = ImageGrab.grab(all_screens=False)
-                
-            img.save(filepath, "PNG")
-            
-            self.counter += 1
-            elapsed = self.get_elapsed_time()
-            line = f"\n*  **[{self.counter}]**   **{elapsed}** - 📸 Screenshot → ![Screenshot](Screenshots/{filename})"
+
+            if not self.screenshots.submit(img, filepath, profile, thumbnail_path):
+                print("Screenshot queue full — frame dropped.")
+                return False
             
-            with open(self.current_file_path, 'a', encoding='utf-8') as f:
-                f.write(line)
-                
-            return True
+            kind = TimelineEvent.SCREENSHOT_THUMB if thumbnail_path else TimelineEvent.SCREENSHOT
+            event = self._record_event(kind, filename, numbered=True, at_ns=at_ns)
+            return self.time_format(event.elapsed)
         except Exception as e:
             print(f"Error taking screenshot: {e}")
             return False
 
+    def save_burst(self, at_ns=None):
+        """
+        Save the frames from the pre-capture buffer and link them from one log entry.
+        Frames are encoded in the background. `at_ns` is the SessionClock.now_ns()
+        of the request.
+        Returns the formatted time of the burst, or False if there were no frames.
+        """
+        if not self.stopwatch_running or not self.current_file_path or not self.burst:
+            return False
+        at_ns = at_ns if at_ns is not None else self.clock.now_ns()
+        frames = self.burst.snapshot()
+        if not frames:
+            return False
+
+        screenshots_dir = os.path.join(self.output_dir, "Screenshots")
+        os.makedirs(screenshots_dir, exist_ok=True)
+        profile = self.screenshot_profile
+        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        filenames = [f"burst_{timestamp_str}_{i:02d}{profile.extension}" for i in range(len(frames))]
+
+        def save_frames():
+            # Waits for room in the saver queue, off the calling thread
+            for (_, image), filename in zip(frames, filenames):
+                self.screenshots.submit(image, os.path.join(screenshots_dir, filename), profile, block=True)
+
+        threading.Thread(target=save_frames, daemon=True).start()
+        event = self._record_event(TimelineEvent.BURST, " ".join(filenames), numbered=True, at_ns=at_ns)
+        return self.time_format(event.elapsed)
+
     def mark_voice_note(self):
         """
-        Record a 10s voice note, transcribe it using Whisper, and mark in the file asynchronously.
+        Record a 10s voice note and queue it for transcription with Whisper.
+
+        The transcription is attached to the most recent timestamp mark once it
+        is ready; a new voice note can be recorded while earlier ones are still
+        being transcribed.
         
         Returns:
             bool: True if recording started, False otherwise.
         """
         if self.current_file_path and self.stopwatch_running:
-            if getattr(self, 'is_transcribing', False):
+            if self.is_voice_recording:
                 return False
-            self.is_transcribing = True
-            import threading
-            threading.Thread(target=self._record_and_transcribe, daemon=True).start()
+            self.is_voice_recording = True
+            counter, elapsed = self._last_mark()
+            threading.Thread(target=self._record_and_transcribe, args=(counter, elapsed), daemon=True).start()
             return True
         return False
 
-    def _record_and_transcribe(self):
+    def _last_mark(self):
+        """Return (counter, elapsed) of the latest numbered entry, for attaching voice notes."""
+        with self._lock:
+            for event in reversed(self.events):
+                if event.counter is not None:
+                    return event.counter, event.elapsed
+            return None, self._elapsed_seconds()
+
+    def _record_and_transcribe(self, counter, elapsed):
         import sounddevice as sd
-        import numpy as np
         
-        if not getattr(self, 'whisper_model', None):
-            if self.gui_callback:
-                self.gui_callback("Model Loading...")
-            import time
-            wait_time = 0
-            while not getattr(self, 'whisper_model', None) and wait_time < 30:
-                time.sleep(1)
-                wait_time += 1
-            if not getattr(self, 'whisper_model', None):
-                if self.gui_callback:
-                    self.gui_callback("Model Error")
-                self.is_transcribing = False
-                return
+        # Load the model while the clip is being recorded
+        if not self.whisper.loaded:
+            self.whisper.prewarm()
             
         duration = 10  # seconds
         fs = 16000
@@ -298,45 +1844,50 @@ class TimestampManager:
         try:
             if self.gui_callback:
                 self.gui_callback("Recording (10s)...")
-                
-            recording = sd.rec(
-                int(duration * fs), samplerate=fs, channels=1, dtype='float32',
-                device=self.mic_device_index
+
+            # Record straight into a preallocated buffer, stopping early once speech ends
+            buffer = AudioCaptureBuffer(duration, fs)
+            endpointer = SpeechEndpointer(fs)
+            speech_ended = threading.Event()
+
+            def callback(indata, frames, time_info, status):
+                if status:
+                    print(status)
+                if speech_ended.is_set():
+                    return
+                buffer.write(indata)
+                if endpointer.update(indata) or buffer.full:
+                    speech_ended.set()
+
+            stream = sd.InputStream(
+                samplerate=fs, channels=1, dtype='float32',
+                device=self.mic_device_index, callback=callback
             )
-            sd.wait()
-            
-            if self.gui_callback:
-                self.gui_callback("Transcribing...")
-                
-            audio_data = recording.flatten()
-            result = self.whisper_model.transcribe(audio_data, fp16=False)
-            transcription = result['text'].strip()
-            
-            if self.gui_callback:
-                # Use a specific format to pass the result back to the GUI
-                self.gui_callback(f"COMPLETE|{transcription}")
+            with stream:
+                # Small margin over the clip length in case the device starts late
+                speech_ended.wait(duration + 1)
+            self.is_voice_recording = False
+            self._queue_transcription(buffer.view(), counter, elapsed)
                 
         except Exception as e:
-            print(f"Transcription error: {e}")
+            print(f"Voice record error: {e}")
             if self.gui_callback:
                 self.gui_callback("Error")
-            import time
-            time.sleep(2)
         finally:
-            self.is_transcribing = False
+            self.is_voice_recording = False
 
     def start_ptt_voice_note(self):
         """Start a push-to-talk voice recording."""
         if not self.current_file_path or not self.stopwatch_running:
             return False
-        if getattr(self, 'is_transcribing', False) or getattr(self, 'is_ptt_recording', False):
+        if self.is_voice_recording or getattr(self, 'is_ptt_recording', False):
             return False
             
         self.is_ptt_recording = True
-        self.ptt_audio_data = []
+        self.ptt_buffer = None
+        counter, elapsed = self._last_mark()
         
-        import threading
-        threading.Thread(target=self._ptt_record_thread, daemon=True).start()
+        threading.Thread(target=self._ptt_record_thread, args=(counter, elapsed), daemon=True).start()
         return True
         
     def stop_ptt_voice_note(self):
@@ -346,34 +1897,27 @@ class TimestampManager:
             return True
         return False
         
-    def _ptt_record_thread(self):
+    def _ptt_record_thread(self, counter, elapsed):
         import time
         import sounddevice as sd
         
-        # Ensure model is loaded first
-        if not getattr(self, 'whisper_model', None):
-            if self.gui_callback:
-                self.gui_callback("Model Loading...")
-            wait_time = 0
-            while not getattr(self, 'whisper_model', None) and wait_time < 30:
-                time.sleep(1)
-                wait_time += 1
-            if not getattr(self, 'whisper_model', None):
-                if self.gui_callback:
-                    self.gui_callback("Model Error")
-                self.is_ptt_recording = False
-                return
+        # Load the model while the user is talking
+        if not self.whisper.loaded:
+            self.whisper.prewarm()
 
         fs = 16000
+        max_seconds = 180
+        # Sized for the hard limit up front; the callback only copies into it
+        buffer = self.ptt_buffer = AudioCaptureBuffer(max_seconds, fs)
         
         def callback(indata, frames, time_info, status):
             if status:
                 print(status)
             if self.is_ptt_recording:
-                self.ptt_audio_data.append(indata.copy())
+                buffer.write(indata)
 
+        streamer = None
         try:
-            max_seconds = 180
             if self.gui_callback:
                 self.gui_callback(f"PTT Recording ({max_seconds}s)...")
                 
@@ -381,79 +1925,430 @@ class TimestampManager:
                 samplerate=fs, channels=1, dtype='float32',
                 device=self.mic_device_index, callback=callback
             )
+            if self.ptt_streaming:
+                streamer = StreamingTranscriber(
+                    self._transcribe_speech, fs=fs, window_seconds=self.ptt_window_seconds
+                )
             
             start_time = time.time()
             with stream:
                 while self.is_ptt_recording:
                     # Hard limit
-                    if time.time() - start_time > max_seconds:
+                    if time.time() - start_time > max_seconds or buffer.full:
                         self.is_ptt_recording = False
                         if self.gui_callback:
                             self.gui_callback("Max Time Reached!")
                         break
+                    if streamer:
+                        streamer.feed(buffer.length, buffer.view)
                     time.sleep(0.1)
             
             # Now stream is closed. Process audio.
-            self._process_ptt_audio()
+            if streamer:
+                self._finish_streaming_ptt(streamer, counter, elapsed)
+            else:
+                self._process_ptt_audio(counter, elapsed)
             
         except Exception as e:
             print(f"PTT Record error: {e}")
+            if streamer:
+                streamer.cancel()
             if self.gui_callback:
                 self.gui_callback("Error")
             self.is_ptt_recording = False
 
-    def _process_ptt_audio(self):
-        import numpy as np
-        
-        if not self.ptt_audio_data:
-            self.is_ptt_recording = False
+    def _finish_streaming_ptt(self, streamer, counter, elapsed):
+        buffer = self.ptt_buffer
+        self.ptt_buffer = None
+        if not buffer.length:
+            streamer.cancel()
             if self.gui_callback:
                 self.gui_callback("No Audio")
             return
-            
-        self.is_transcribing = True
         if self.gui_callback:
             self.gui_callback("Transcribing...")
+        try:
+            transcription = streamer.finish(buffer.length, buffer.view)
+            self._deliver_transcription(transcription, counter, elapsed)
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            if self.gui_callback:
+                self.gui_callback("Error")
+
+    def _process_ptt_audio(self, counter, elapsed):
+        buffer = self.ptt_buffer
+        self.ptt_buffer = None
+        if not buffer or not buffer.length:
+            self.is_ptt_recording = False
+            if self.gui_callback:
+                self.gui_callback("No Audio")
+            return
+
+        # Zero-copy: the queued job keeps the buffer alive until it is transcribed
+        self._queue_transcription(buffer.view(), counter, elapsed)
+
+    @property
+    def is_transcribing(self):
+        return self.transcriptions.depth > 0
+
+    def transcription_queue_depth(self):
+        """Number of voice notes waiting for or undergoing transcription."""
+        return self.transcriptions.depth
+
+    def _queue_transcription(self, audio, counter, elapsed):
+        job = TranscriptionJob(audio, counter, elapsed)
+        if not self.transcriptions.submit(job):
+            if self.gui_callback:
+                self.gui_callback("Queue Full!")
+            return False
+        if self.gui_callback:
+            self.gui_callback(self._transcribing_status())
+        return True
+
+    def _transcribing_status(self):
+        depth = self.transcriptions.depth
+        if depth > 1:
+            return f"Transcribing... ({depth} queued)"
+        return "Transcribing..."
+
+    def _deliver_transcription(self, transcription, counter, elapsed):
+        """Write a finished transcription to the log and notify the GUI."""
+        if transcription:
+            self.append_voice_note(transcription, counter, elapsed)
+            if self.gui_callback:
+                # Use a specific format to pass the result back to the GUI
+                self.gui_callback(f"COMPLETE|{transcription}")
+        else:
+            if self.gui_callback:
+                self.gui_callback("No speech detected")
+
+    def _transcribe_speech(self, audio):
+        """
+        Trim silence from a recording and transcribe what is left.
+
+        Returns:
+            str: The transcription, or "" without running Whisper if the recording is silent.
+        """
+        bounds = detect_speech(audio)
+        if bounds is None:
+            return ""
+        start, end = bounds
+        return self.whisper.transcribe(audio[start:end])
 
+    def _transcribe_job(self, job):
+        """Worker-side handling of one queued voice note."""
+        bounds = detect_speech(job.audio)
+        if bounds is None:
+            # Silent recording; don't even load the model
+            self._deliver_transcription("", job.counter, job.elapsed)
+            return
+        if not self._ensure_whisper_model():
+            return
         try:
-            # Concatenate chunks and flatten into 1D array
-            full_audio = np.concatenate(self.ptt_audio_data, axis=0)
-            audio_data = full_audio.flatten()
-            
-            result = self.whisper_model.transcribe(audio_data, fp16=False)
-            transcription = result['text'].strip()
-            
-            if transcription:
-                if self.gui_callback:
-                    self.gui_callback(f"COMPLETE|{transcription}")
-            else:
-                if self.gui_callback:
-                    self.gui_callback("No speech detected")
-                    
+            start, end = bounds
+            transcription = self.whisper.transcribe(job.audio[start:end])
+            self._deliver_transcription(transcription, job.counter, job.elapsed)
         except Exception as e:
             print(f"Transcription error: {e}")
             if self.gui_callback:
                 self.gui_callback("Error")
-        finally:
-            self.is_transcribing = False
-            self.ptt_audio_data = []
 
     def get_recent_log_events(self, count=3):
-        """Parse the active file to retrieve the last few marked lines/notes."""
-        content = self.read_file_content()
-        if not content:
-            return []
-            
-        events = []
-        for line in content.splitlines():
-            line = line.strip()
-            if not line: continue
-            if line.startswith("# ") and "SHORT" not in line and "ERROR" not in line: continue
-            if line == "---" or "Total Recording Time:" in line: continue
-            if "Starting Notes" in line or "Ending Notes" in line: continue
-            
-            # Clean up some markdown artifacts for cleaner HUD display
-            display_line = line.replace("**", "").replace("📺  Scene →", "📺")
-            events.append(display_line.strip())
-            
-        return events[-count:]
+        """Return HUD lines for the last few marked lines/notes, newest last."""
+        with self._lock:
+            recent = list(islice(reversed(self.recent_events), count))
+        return recent[::-1]
+
+
+class HeadlessSession:
+    """
+    Drive a TimestampManager from one-line text commands, without Tk.
+
+    Used by the headless entry point (`python -m timestamp_functions --headless`)
+    for capture boxes without a display. Each command returns one response
+    line: "ok" plus an optional value, or "error" plus a reason.
+    """
+
+    COMMANDS = {
+        'new': "new [NAME]      start a new session file in the output folder",
+        'open': "open NAME       continue a session file in the output folder",
+        'start': "start           start the stopwatch (opens a new file if needed)",
+        'mark': "mark [NOTE]     mark the current time, optionally with a note",
+        'short': "short           save a short marker",
+        'scene': "scene NAME      write a scene change marker",
+        'screenshot': "screenshot      capture the screen and link it",
+        'burst': "burst           save the pre-capture buffer",
+        'voice': "voice           mark the time and record a 10 s voice note",
+        'stop': "stop            stop the stopwatch",
+        'status': "status          show the file, elapsed time and queued transcriptions",
+        'help': "help            list commands",
+        'quit': "quit            flush everything and exit",
+    }
+
+    # Keybind action -> command, for --keybinds hotkeys
+    ACTION_COMMANDS = {
+        'create_file': 'new', 'start_recording': 'start', 'mark_time': 'mark',
+        'stop_recording': 'stop', 'save_short': 'short', 'mark_voice_note': 'voice',
+        'take_screenshot': 'screenshot', 'save_burst': 'burst',
+    }
+
+    def __init__(self, manager, out_dir):
+        self.manager = manager
+        self.manager.set_output_dir(out_dir)
+        self.closed = False
+
+    def execute(self, line, at_ns=None):
+        """
+        Run one command line.
+
+        Args:
+            line (str): Command and optional argument, e.g. "mark Boss fight".
+            at_ns (int, optional): SessionClock.now_ns() when the command arrived.
+
+        Returns:
+            str: The response line.
+        """
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
+        command, _, arg = line.strip().partition(" ")
+        command = command.lower()
+        arg = arg.strip()
+        if not command:
+            return "error empty command"
+        handler = getattr(self, f"_cmd_{command}", None)
+        if handler is None:
+            return f"error unknown command '{command}' (try 'help')"
+        try:
+            return handler(arg, at_ns)
+        except Exception as e:
+            return f"error {e}"
+
+    def _result(self, value, failure):
+        if value:
+            return "ok" if value is True else f"ok {value}"
+        return f"error {failure}"
+
+    def _session_path(self, name):
+        """
+        Resolve a session file name inside the output folder.
+
+        Returns:
+            str: The absolute path, or None for absolute names and names that
+                 would leave the folder (via '..' or a symlink).
+        """
+        if os.path.isabs(name) or os.path.splitdrive(name)[0]:
+            return None
+        root = os.path.realpath(self.manager.output_dir)
+        path = os.path.realpath(os.path.join(root, name))
+        if path == root or os.path.commonpath([root, path]) != root:
+            return None
+        return path
+
+    def resume(self, name):
+        """
+        Continue a session file in the output folder that was left recording.
+
+        Returns:
+            str: The response line.
+        """
+        path = self._session_path(name)
+        if path is None:
+            return "error the file must be inside the output folder"
+        self.manager.open_file(path, resume=True)
+        if not self.manager.stopwatch_running:
+            return f"error {path} was not left recording (or is too old to resume)"
+        return f"ok {path} {self.manager.get_elapsed_time()}"
+
+    def _cmd_new(self, arg, at_ns):
+        if self.manager.stopwatch_running:
+            return "error stop the current recording first"
+        path = self._session_path(arg or self.manager.default_file_name())
+        if path is None:
+            return "error the file must be inside the output folder"
+        return f"ok {self.manager.open_file(path)}"
+
+    def _cmd_open(self, arg, at_ns):
+        if not arg:
+            return "error open needs a file name"
+        if self.manager.stopwatch_running:
+            return "error stop the current recording first"
+        path = self._session_path(arg)
+        if path is None:
+            return "error the file must be inside the output folder"
+        return f"ok {self.manager.open_file(path)}"
+
+    def _cmd_start(self, arg, at_ns):
+        if not self.manager.current_file_path:
+            self._cmd_new("", at_ns)
+        return self._result(self.manager.start_recording(at_ns=at_ns), "already recording")
+
+    def _cmd_mark(self, arg, at_ns):
+        if arg:
+            return self._result(self.manager.mark_custom_note(arg, at_ns=at_ns), "not recording")
+        return self._result(self.manager.mark_time(at_ns=at_ns), "not recording")
+
+    def _cmd_short(self, arg, at_ns):
+        return self._result(self.manager.save_short(at_ns=at_ns), "no file open")
+
+    def _cmd_scene(self, arg, at_ns):
+        if not arg:
+            return "error scene needs a name"
+        return self._result(self.manager.mark_scene(arg, at_ns=at_ns), "not recording")
+
+    def _cmd_screenshot(self, arg, at_ns):
+        return self._result(self.manager.take_screenshot(at_ns=at_ns), "not recording or capture failed")
+
+    def _cmd_burst(self, arg, at_ns):
+        return self._result(self.manager.save_burst(at_ns=at_ns), "burst buffer is off or empty")
+
+    def _cmd_voice(self, arg, at_ns):
+        if self.manager.is_voice_recording:
+            return "error already recording a voice note"  # Before marking, so the log is untouched
+        elapsed = self.manager.mark_time(at_ns=at_ns)
+        if not elapsed:
+            return "error not recording"
+        return self._result(self.manager.mark_voice_note() and elapsed, "already recording a voice note")
+
+    def _cmd_stop(self, arg, at_ns):
+        return self._result(self.manager.stop_recording(at_ns=at_ns), "not recording")
+
+    def _cmd_status(self, arg, at_ns):
+        elapsed = self.manager.get_elapsed_time() or "stopped"
+        path = self.manager.current_file_path or "no file"
+        return f"ok {path} {elapsed} transcriptions={self.manager.transcription_queue_depth()}"
+
+    def _cmd_help(self, arg, at_ns):
+        return "ok " + " ".join(self.COMMANDS)
+
+    def _cmd_quit(self, arg, at_ns):
+        self.close()
+        return "ok bye"
+
+    def close(self):
+        """Stop any recording and flush all writes."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.manager.stopwatch_running:
+            self.manager.stop_recording()
+        self.manager.close()
+
+    def hotkey_handlers(self, keybinds, custom_texts):
+        """
+        Build pynput on_press/on_release handlers that run commands for bound keys.
+
+        Args:
+            keybinds (dict): action_id -> key name, as in keybinds.json.
+            custom_texts (dict): custom_note_N -> note text.
+        """
+        hotkeys = HotkeyDispatcher(keybinds)
+
+        def on_press(key):
+            hit = hotkeys.press(key)
+            if hit is None:
+                return
+            action_id, at_ns = hit
+            if action_id in custom_texts:
+                line = f"mark {custom_texts[action_id]}"
+            else:
+                line = self.ACTION_COMMANDS.get(action_id)
+            if line:
+                print(f"{line} -> {self.execute(line, at_ns)}", flush=True)
+
+        def on_release(key):
+            hotkeys.release(key)
+
+        return on_press, on_release
+
+
+def run_headless(out_dir, keybinds_path=None, time_style="seconds", fps=60, stream=None,
+                 control=False, socket_path=None, http_port=0, resume=None):
+    """
+    Run a headless session reading commands from `stream` (default stdin) until EOF or 'quit'.
+
+    `resume` names a session file in `out_dir` to continue if the previous run
+    stopped while it was recording.
+
+    Responses go to stdout, one line per command; transcription progress goes to stderr.
+    With `control`, the same commands are also served by timestamp_control.ControlServer,
+    and the session keeps running after stdin closes until interrupted.
+    """
+    import sys
+
+    stream = stream or sys.stdin
+    manager = TimestampManager(base_path=out_dir)
+    manager.set_time_format(time_style, fps)
+    manager.register_gui_callback(lambda status: print(f"voice: {status}", file=sys.stderr, flush=True))
+    session = HeadlessSession(manager, out_dir)
+    if resume:
+        print(f"resume -> {session.resume(resume)}", flush=True)
+
+    listener = None
+    if keybinds_path:
+        with open(keybinds_path) as f:
+            data = json.load(f)
+        keybinds = data.get('keybinds', data)
+        from pynput import keyboard
+        on_press, on_release = session.hotkey_handlers(keybinds, data.get('custom_texts', {}))
+        listener = keyboard.Listener(on_press=on_press, on_release=on_release)
+        listener.start()
+
+    server = None
+    if control:
+        from timestamp_control import ControlServer
+        server = ControlServer(session.execute, socket_path, http_port)
+        if not server.start():
+            print(f"Control server failed to start: {server.error}", file=sys.stderr)
+
+    try:
+        for line in stream:
+            at_ns = SessionClock.now_ns()
+            if not line.strip():
+                continue
+            print(session.execute(line, at_ns), flush=True)
+            if session.closed:
+                break
+        else:
+            # stdin closed (e.g. run as a service): keep serving control clients
+            while server and server.running:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server:
+            server.stop()
+        if listener:
+            listener.stop()
+        session.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m timestamp_functions",
+        description="Record timestamp sessions without the GUI. Commands are read from stdin, one per line.",
+        epilog="Commands:\n  " + "\n  ".join(HeadlessSession.COMMANDS.values()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--headless", action="store_true", help="Run without Tk (required)")
+    parser.add_argument("--out", default=os.path.join(os.getcwd(), "Timestamp_TXT"),
+                        help="Folder for session files and screenshots")
+    parser.add_argument("--keybinds", help="keybinds.json to also listen for global hotkeys (needs pynput)")
+    parser.add_argument("--time-format", choices=ElapsedFormat.STYLES, default="seconds")
+    parser.add_argument("--fps", type=int, default=60, help="Frame rate for --time-format frames")
+    parser.add_argument("--control", action="store_true",
+                        help="Also accept commands from the local control socket (see timestamp_control.py)")
+    parser.add_argument("--control-socket", help="Control socket path (default: in the temp folder)")
+    parser.add_argument("--http-port", type=int, default=0, help="Also serve the control API on localhost HTTP")
+    parser.add_argument("--resume", metavar="NAME",
+                        help="Continue this session file from --out if the last run stopped mid-recording")
+    args = parser.parse_args(argv)
+    if not args.headless:
+        parser.error("only --headless mode runs from here; start timestamp_gui.py for the app")
+    run_headless(args.out, args.keybinds, args.time_format, args.fps,
+                 control=args.control, socket_path=args.control_socket, http_port=args.http_port,
+                 resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,47 @@
+import sys
+import time
+
+# Cold-start budget from launch to the first drawn frame, checked by --profile-startup
+STARTUP_BUDGET_MS = 1000
+CONTROL_REPLY_TIMEOUT = 10  # Seconds a control API command waits for the Tk thread
+_startup_steps = []  # (label, seconds) for --profile-startup
+_startup_t0 = _startup_mark = time.perf_counter()
+
+def _startup_step(label):
+    """Record how long the startup step that just finished took."""
+    global _startup_mark
+    now = time.perf_counter()
+    _startup_steps.append((label, now - _startup_mark))
+    _startup_mark = now
+
 import tkinter as tk
 from tkinter import font, messagebox, filedialog
-from pynput import keyboard
-from threading import Thread
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeout
+from threading import Lock, Thread
+import hashlib
 import json
 import os
-import sys
+_startup_step("import tkinter + stdlib")
 import customtkinter as ctk
+_startup_step("import customtkinter")
 
-# Import the TimestampManager and OBSManager from local modules
-from timestamp_functions import TimestampManager
+# Import the TimestampManager and OBSManager from local modules.
+# Whisper, numpy, sounddevice, PIL and obsws_python are imported where they are first used.
+from timestamp_functions import (
+    HeadlessSession, HotkeyDispatcher, SessionClock, TimestampManager, WhisperModel, format_elapsed, hotkey_name,
+)
 from timestamp_obs import OBSManager
+_startup_step("import timestamp_functions + timestamp_obs")
+
+keyboard = None  # pynput.keyboard, loaded by load_keyboard() once the window is up
+
+def load_keyboard():
+    """Import pynput's keyboard module on first use."""
+    global keyboard
+    if keyboard is None:
+        from pynput import keyboard as pynput_keyboard
+        keyboard = pynput_keyboard
+    return keyboard
 
 def get_base_path() -> str:
     """Gets the base path for the application, whether running as a script or a frozen exe."""
@@ -18,17 +50,25 @@ def get_base_path() -> str:
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
+_input_devices = None
+
 def get_input_devices():
     """
     Returns a list of (index, name) tuples for all available audio input devices.
     Falls back to an empty list if sounddevice is unavailable.
+
+    The list is queried once per run: PortAudio only scans devices when it is
+    initialised, so asking again would return the same list anyway.
     """
-    try:
-        import sounddevice as sd
-        devices = sd.query_devices()
-        return [(i, d['name']) for i, d in enumerate(devices) if d['max_input_channels'] > 0]
-    except Exception:
-        return []
+    global _input_devices
+    if _input_devices is None:
+        try:
+            import sounddevice as sd
+            devices = sd.query_devices()
+            _input_devices = [(i, d['name']) for i, d in enumerate(devices) if d['max_input_channels'] > 0]
+        except Exception:
+            _input_devices = []
+    return _input_devices
 
 class Theme:
     """A centralized class for managing the application's visual theme."""
@@ -56,8 +96,42 @@ class Theme:
     FONT_BUTTON = (FONT_FAMILY, 12, "bold")
     FONT_TEXT_AREA = ("Consolas", 12)
 
+def border_pulse(bright, dim, steps):
+    """
+    Precompute one glow cycle between two hex colors: dim -> bright -> back to just above dim.
+
+    Returns the hex strings for every animation frame, so the animation loop
+    only indexes into the list.
+    """
+    c1 = tuple(int(bright[i:i+2], 16) for i in (1, 3, 5))
+    c2 = tuple(int(dim[i:i+2], 16) for i in (1, 3, 5))
+    ratios = [step / steps for step in range(steps + 1)]
+    ratios += ratios[-2:0:-1]
+    return [
+        "#{:02x}{:02x}{:02x}".format(*(int(a * ratio + b * (1 - ratio)) for a, b in zip(c1, c2)))
+        for ratio in ratios
+    ]
+
+def border_tables(colors, steps):
+    """border_pulse() for every state in a {state: (bright, dim)} mapping."""
+    # A function, because a comprehension in a class body cannot see the class's other attributes
+    return {state: border_pulse(bright, dim, steps) for state, (bright, dim) in colors.items()}
+
 class RecordingWidget(ctk.CTkToplevel):
     """A floating HUD widget to show recording time, status, and recent logs."""
+    BORDER_COLORS = {
+        "recording": ("#FF3333", "#660000"),
+        "transcribing": ("#FF9900", "#663300"),
+        "error": ("#FF0000", "#330000"),
+        "success": ("#00FF99", "#003311"),
+    }
+    BORDER_STEPS = 20
+    BORDER_FRAME_MS = 50
+    # Glow frames per state, built once; the animation loop only indexes into them
+    BORDER_TABLES = border_tables(BORDER_COLORS, BORDER_STEPS)
+    # States whose glow never changes color need no animation frames at all
+    STATIC_STATES = {state for state, table in BORDER_TABLES.items() if len(set(table)) == 1}
+
     def __init__(self, parent):
         super().__init__(parent.root)
         self.parent = parent
@@ -69,13 +143,14 @@ class RecordingWidget(ctk.CTkToplevel):
         self.minsize(210, 110)
         self.resizable(False, False)
         self._countdown_job = None
+        self._timer_job = None
+        self._anim_job = None
         
         self.create_widgets()
         self.update_timer()
         
-        # Border animation states
-        self.anim_step = 0
-        self.anim_dir = 1
+        # Border animation state
+        self.anim_frame = 0
         self.current_border_state = "recording" # default
         self._animate_border()
         
@@ -99,59 +174,49 @@ class RecordingWidget(ctk.CTkToplevel):
         self.status_label = ctk.CTkLabel(top_frame, text="", font=Theme.FONT_BODY, text_color=Theme.RED)
         self.status_label.pack(side=tk.TOP, pady=(5, 10))
 
+    def _is_hidden(self):
+        return self.state() == 'withdrawn'
+
     def update_timer(self):
+        """Show the elapsed time, then sleep until the session clock reaches the next whole second."""
         if not self.winfo_exists(): return
-        if self.parent.timestamp_manager.stopwatch_running:
-            elapsed_str = self.parent.timestamp_manager.get_elapsed_time()
-            if elapsed_str:
-                self.time_label.configure(text=elapsed_str)
-            self.after(500, self.update_timer)
+        if self._timer_job:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        tm = self.parent.timestamp_manager
+        elapsed_ns = tm.clock.elapsed_ns() if tm.stopwatch_running else None
+        if elapsed_ns is None or self._is_hidden():
+            return
+        self.time_label.configure(text=format_elapsed(elapsed_ns / 1e9))
+        ms_into_second = (elapsed_ns // 1_000_000) % 1000
+        # +1 ms so the wake lands just after the boundary, not just before it
+        self._timer_job = self.after(1000 - ms_into_second + 1, self.update_timer)
 
     def set_border_state(self, state):
+        if state not in self.BORDER_TABLES:
+            state = "recording"
         self.current_border_state = state
-        self.anim_step = 0
-        self.anim_dir = 1
+        self.anim_frame = 0
+        self._animate_border()
 
     def _animate_border(self):
         if not self.winfo_exists(): return
-        states = {
-            "recording": ("#FF3333", "#660000"),
-            "transcribing": ("#FF9900", "#663300"),
-            "error": ("#FF0000", "#330000"),
-            "success": ("#00FF99", "#003311"),
-        }
-        
-        if self.current_border_state not in states:
-            self.current_border_state = "recording"
-            
-        color1, color2 = states[self.current_border_state]
-        
-        def hex_to_rgb(h): return tuple(int(h[i:i+2], 16) for i in (1, 3, 5))
-        def rgb_to_hex(r, g, b): return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
-        
-        c1, c2 = hex_to_rgb(color1), hex_to_rgb(color2)
-        
-        steps = 20
-        self.anim_step += self.anim_dir
-        if self.anim_step >= steps:
-            self.anim_step = steps
-            self.anim_dir = -1
-        elif self.anim_step <= 0:
-            self.anim_step = 0
-            self.anim_dir = 1
-            
-        ratio = self.anim_step / steps
-        r = c1[0] * ratio + c2[0] * (1 - ratio)
-        g = c1[1] * ratio + c2[1] * (1 - ratio)
-        b = c1[2] * ratio + c2[2] * (1 - ratio)
-        
-        new_color = rgb_to_hex(r, g, b)
+        if self._anim_job:
+            self.after_cancel(self._anim_job)
+            self._anim_job = None
+
+        table = self.BORDER_TABLES[self.current_border_state]
+        static = self.current_border_state in self.STATIC_STATES
+        color = table[self.anim_frame]
         try:
-            self.main_frame.configure(border_color=new_color)
+            self.main_frame.configure(border_color=color)
         except Exception:
             return
-            
-        self._anim_job = self.after(50, self._animate_border)
+
+        if static or self._is_hidden():
+            return  # Nothing changes until the next state change or show_widget()
+        self.anim_frame = (self.anim_frame + 1) % len(table)
+        self._anim_job = self.after(self.BORDER_FRAME_MS, self._animate_border)
 
     def show_status(self, message, duration=3000, color=Theme.GREEN):
         if hasattr(self, '_countdown_job') and self._countdown_job and not message.startswith("Recording:"):
@@ -162,7 +227,7 @@ class RecordingWidget(ctk.CTkToplevel):
         
         # Update border state temporally
         if color == Theme.RED: self.set_border_state("error")
-        elif color == Theme.PURPLE or message == "Transcribing...": self.set_border_state("transcribing")
+        elif color == Theme.PURPLE or message.startswith("Transcribing..."): self.set_border_state("transcribing")
         else: self.set_border_state("success")
             
         if hasattr(self, '_hide_status_job') and self._hide_status_job:
@@ -186,16 +251,33 @@ class RecordingWidget(ctk.CTkToplevel):
             self.show_status("Transcribing...", duration=3000, color=Theme.ORANGE)
 
     def destroy(self):
-        if hasattr(self, '_anim_job'): self.after_cancel(self._anim_job)
+        if self._anim_job: self.after_cancel(self._anim_job)
+        if self._timer_job: self.after_cancel(self._timer_job)
         if hasattr(self, '_countdown_job') and self._countdown_job: self.after_cancel(self._countdown_job)
         if hasattr(self, '_hide_status_job') and self._hide_status_job: self.after_cancel(self._hide_status_job)
         super().destroy()
 
     def hide_widget(self):
         self.withdraw()
+        # Withdrawn: stop the clock and glow until the HUD is shown again
+        for job in (self._timer_job, self._anim_job):
+            if job: self.after_cancel(job)
+        self._timer_job = self._anim_job = None
+
+    def show_widget(self):
+        self.deiconify()
+        self.update_timer()
+        self._animate_border()
 
 class SettingsWindow(ctk.CTkToplevel):
     """A Toplevel window for app settings, organised into tabs."""
+    WHISPER_IDLE_CHOICES = [
+        ("Never", 0), ("5 min", 300), ("10 min", 600), ("30 min", 1800),
+    ]
+    TIME_STYLE_CHOICES = [
+        ("HH:MM:SS", "seconds"), ("HH:MM:SS.mmm", "milliseconds"), ("HH:MM:SS:FF", "frames"),
+    ]
+
     def __init__(self, parent):
         super().__init__(parent.root)
         self.parent = parent
@@ -211,6 +293,11 @@ class SettingsWindow(ctk.CTkToplevel):
         self.new_obs_settings = parent.obs_settings.copy()
         self.new_hud_enabled = parent.hud_enabled
         self.new_hud_opacity = parent.hud_opacity
+        self.new_whisper_settings = parent.whisper_settings.copy()
+        self.new_screenshot_settings = parent.screenshot_settings.copy()
+        self.new_burst_settings = parent.burst_settings.copy()
+        self.new_time_settings = parent.time_settings.copy()
+        self.new_control_settings = parent.control_settings.copy()
         self.bind_buttons = {}
         self.text_entries = {}
         self._input_devices = get_input_devices()
@@ -313,6 +400,139 @@ class SettingsWindow(ctk.CTkToplevel):
         self.opacity_slider.set(self.new_hud_opacity)
         self.opacity_slider.pack(side=tk.LEFT)
 
+        # Voice Transcription — spans both columns
+        ctk.CTkLabel(gen, text="Voice Transcription", font=Theme.FONT_SUBTITLE, anchor='w').grid(
+            row=3, column=0, columnspan=2, sticky='w', padx=(8, 8), pady=(0, 2))
+
+        whisper_frame = ctk.CTkFrame(gen)
+        whisper_frame.grid(row=4, column=0, columnspan=2, sticky='ew', padx=(8, 8), pady=(0, 12))
+        whisper_frame.columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(whisper_frame, text="Model Size:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=0, column=0, sticky='w', padx=10, pady=(10, 5))
+        self.whisper_size_var = ctk.StringVar(value=self.new_whisper_settings['model_size'])
+        ctk.CTkOptionMenu(
+            whisper_frame, values=list(WhisperModel.MODEL_SIZES), variable=self.whisper_size_var,
+            font=Theme.FONT_BODY,
+        ).grid(row=0, column=1, sticky='e', padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(whisper_frame, text="Unload When Idle:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=1, column=0, sticky='w', padx=10, pady=5)
+        current_idle = self.WHISPER_IDLE_CHOICES[0][0]
+        for label, seconds in self.WHISPER_IDLE_CHOICES:
+            if seconds == self.new_whisper_settings['idle_unload_seconds']:
+                current_idle = label
+        self.whisper_idle_var = ctk.StringVar(value=current_idle)
+        ctk.CTkOptionMenu(
+            whisper_frame, values=[label for label, _ in self.WHISPER_IDLE_CHOICES],
+            variable=self.whisper_idle_var, font=Theme.FONT_BODY,
+        ).grid(row=1, column=1, sticky='e', padx=10, pady=5)
+
+        self.whisper_prewarm_var = ctk.BooleanVar(value=self.new_whisper_settings['prewarm'])
+        ctk.CTkCheckBox(
+            whisper_frame, text="Load model when recording starts",
+            variable=self.whisper_prewarm_var, font=Theme.FONT_BODY
+        ).grid(row=2, column=0, columnspan=2, sticky='w', padx=10, pady=5)
+
+        ctk.CTkLabel(whisper_frame, text="Transcription Workers:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=3, column=0, sticky='w', padx=10, pady=(5, 10))
+        self.whisper_workers_var = ctk.StringVar(value=str(self.new_whisper_settings['workers']))
+        ctk.CTkOptionMenu(
+            whisper_frame, values=["1", "2", "3", "4"], variable=self.whisper_workers_var,
+            font=Theme.FONT_BODY,
+        ).grid(row=3, column=1, sticky='e', padx=10, pady=5)
+
+        self.ptt_streaming_var = ctk.BooleanVar(value=self.new_whisper_settings['ptt_streaming'])
+        ctk.CTkCheckBox(
+            whisper_frame, text="Transcribe PTT memos while still talking",
+            variable=self.ptt_streaming_var, font=Theme.FONT_BODY
+        ).grid(row=4, column=0, columnspan=2, sticky='w', padx=10, pady=(5, 10))
+
+        # Screenshots — spans both columns
+        ctk.CTkLabel(gen, text="Screenshots", font=Theme.FONT_SUBTITLE, anchor='w').grid(
+            row=5, column=0, columnspan=2, sticky='w', padx=(8, 8), pady=(0, 2))
+
+        shot_frame = ctk.CTkFrame(gen)
+        shot_frame.grid(row=6, column=0, columnspan=2, sticky='ew', padx=(8, 8), pady=(0, 12))
+        shot_frame.columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(shot_frame, text="Format:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=0, column=0, sticky='w', padx=10, pady=(10, 5))
+        self.shot_format_var = ctk.StringVar(value=self.new_screenshot_settings['format'].upper())
+        ctk.CTkOptionMenu(
+            shot_frame, values=["PNG", "JPEG", "WEBP"], variable=self.shot_format_var,
+            font=Theme.FONT_BODY,
+        ).grid(row=0, column=1, sticky='e', padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(shot_frame, text="Max Width:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=1, column=0, sticky='w', padx=10, pady=5)
+        max_width = self.new_screenshot_settings['max_width']
+        self.shot_width_var = ctk.StringVar(value=str(max_width) if max_width else "Full")
+        ctk.CTkOptionMenu(
+            shot_frame, values=["Full", "2560", "1920", "1280"], variable=self.shot_width_var,
+            font=Theme.FONT_BODY,
+        ).grid(row=1, column=1, sticky='e', padx=10, pady=5)
+
+        self.shot_thumb_var = ctk.BooleanVar(value=bool(self.new_screenshot_settings['thumbnail_width']))
+        ctk.CTkCheckBox(
+            shot_frame, text="Embed thumbnails in the log",
+            variable=self.shot_thumb_var, font=Theme.FONT_BODY
+        ).grid(row=2, column=0, columnspan=2, sticky='w', padx=10, pady=5)
+
+        self.burst_var = ctk.BooleanVar(value=self.new_burst_settings['enabled'])
+        ctk.CTkCheckBox(
+            shot_frame, text="Keep a rolling pre-capture buffer for Save Burst",
+            variable=self.burst_var, font=Theme.FONT_BODY
+        ).grid(row=3, column=0, columnspan=2, sticky='w', padx=10, pady=(5, 10))
+
+        # Timestamp format — spans both columns
+        ctk.CTkLabel(gen, text="Timestamps", font=Theme.FONT_SUBTITLE, anchor='w').grid(
+            row=7, column=0, columnspan=2, sticky='w', padx=(8, 8), pady=(0, 2))
+
+        time_frame = ctk.CTkFrame(gen)
+        time_frame.grid(row=8, column=0, columnspan=2, sticky='ew', padx=(8, 8), pady=(0, 12))
+        time_frame.columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(time_frame, text="Format:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=0, column=0, sticky='w', padx=10, pady=(10, 5))
+        style_label = next(
+            (label for label, style in self.TIME_STYLE_CHOICES if style == self.new_time_settings['style']),
+            self.TIME_STYLE_CHOICES[0][0],
+        )
+        self.time_style_var = ctk.StringVar(value=style_label)
+        ctk.CTkOptionMenu(
+            time_frame, values=[label for label, _ in self.TIME_STYLE_CHOICES],
+            variable=self.time_style_var, font=Theme.FONT_BODY,
+        ).grid(row=0, column=1, sticky='e', padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(time_frame, text="Frame Rate:", font=Theme.FONT_BODY, anchor='w').grid(
+            row=1, column=0, sticky='w', padx=10, pady=(5, 10))
+        self.time_fps_var = ctk.StringVar(value=str(self.new_time_settings['fps']))
+        ctk.CTkOptionMenu(
+            time_frame, values=["24", "25", "30", "50", "60"], variable=self.time_fps_var,
+            font=Theme.FONT_BODY,
+        ).grid(row=1, column=1, sticky='e', padx=10, pady=(5, 10))
+
+        # Control API — spans both columns
+        ctk.CTkLabel(gen, text="Control API", font=Theme.FONT_SUBTITLE, anchor='w').grid(
+            row=9, column=0, columnspan=2, sticky='w', padx=(8, 8), pady=(0, 2))
+
+        control_frame = ctk.CTkFrame(gen)
+        control_frame.grid(row=10, column=0, columnspan=2, sticky='ew', padx=(8, 8), pady=(0, 12))
+        control_frame.columnconfigure((0, 1), weight=1)
+
+        self.control_var = ctk.BooleanVar(value=self.new_control_settings['enabled'])
+        ctk.CTkCheckBox(
+            control_frame, text="Accept commands from Stream Deck / scripts (local only)",
+            variable=self.control_var, font=Theme.FONT_BODY
+        ).grid(row=0, column=0, columnspan=2, sticky='w', padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(control_frame, text="HTTP Port (0 = off):", font=Theme.FONT_BODY, anchor='w').grid(
+            row=1, column=0, sticky='w', padx=10, pady=(5, 10))
+        self.control_http_entry = ctk.CTkEntry(control_frame, width=90, font=Theme.FONT_BODY)
+        self.control_http_entry.insert(0, str(self.new_control_settings['http_port']))
+        self.control_http_entry.grid(row=1, column=1, sticky='e', padx=10, pady=(5, 10))
+
         # ── OBS TAB ───────────────────────────────────────────────────────────
         obs = ctk.CTkScrollableFrame(tab_obs, fg_color="transparent")
         obs.grid(row=0, column=0, sticky='nsew')
@@ -410,8 +630,7 @@ class SettingsWindow(ctk.CTkToplevel):
             if self.parent.mini_widget is None or not self.parent.mini_widget.winfo_exists():
                 self.parent.mini_widget = RecordingWidget(self.parent)
             else:
-                self.parent.mini_widget.deiconify()
-                self.parent.mini_widget.update_timer()
+                self.parent.mini_widget.show_widget()
 
     def _test_obs_connection(self):
         self.obs_test_label.configure(text="Testing...", text_color=Theme.GREY)
@@ -452,7 +671,7 @@ class SettingsWindow(ctk.CTkToplevel):
             button.configure(text=new_key_str.upper(), state="normal")
             return False
 
-        listener = keyboard.Listener(on_press=on_press_capture)
+        listener = load_keyboard().Listener(on_press=on_press_capture)
         listener.start()
 
     def save_and_close(self):
@@ -470,6 +689,40 @@ class SettingsWindow(ctk.CTkToplevel):
                     self.new_mic_device_index = idx
                     break
 
+        # Gather voice transcription settings
+        idle_seconds = dict(self.WHISPER_IDLE_CHOICES).get(self.whisper_idle_var.get(), 600)
+        self.new_whisper_settings = {
+            'model_size': self.whisper_size_var.get(),
+            'idle_unload_seconds': idle_seconds,
+            'prewarm': self.whisper_prewarm_var.get(),
+            'workers': int(self.whisper_workers_var.get()),
+            'ptt_streaming': self.ptt_streaming_var.get(),
+            'ptt_window_seconds': self.new_whisper_settings['ptt_window_seconds'],
+        }
+
+        # Gather screenshot settings
+        width = self.shot_width_var.get()
+        self.new_screenshot_settings.update({
+            'format': self.shot_format_var.get().lower(),
+            'max_width': 0 if width == "Full" else int(width),
+            'thumbnail_width': 480 if self.shot_thumb_var.get() else 0,
+        })
+
+        self.new_burst_settings['enabled'] = self.burst_var.get()
+
+        # Gather control API settings
+        http_port = self.control_http_entry.get().strip()
+        self.new_control_settings.update({
+            'enabled': self.control_var.get(),
+            'http_port': int(http_port) if http_port.isdigit() else 0,
+        })
+
+        # Gather timestamp format settings
+        self.new_time_settings = {
+            'style': dict(self.TIME_STYLE_CHOICES)[self.time_style_var.get()],
+            'fps': int(self.time_fps_var.get()),
+        }
+
         # Gather OBS settings
         self.new_obs_settings = {
             'host': self.obs_host_entry.get().strip(),
@@ -479,18 +732,197 @@ class SettingsWindow(ctk.CTkToplevel):
         }
 
         self.parent.keybinds = self.new_keybinds
+        self.parent._rebuild_hotkey_index()
         self.parent.custom_texts = self.new_custom_texts
         self.parent.output_folder = self.new_output_folder
         self.parent.mic_device_index = self.new_mic_device_index
         self.parent.obs_settings = self.new_obs_settings
         self.parent.hud_enabled = self.hud_var.get()
         self.parent.hud_opacity = self.opacity_slider.get()
+        self.parent.whisper_settings = self.new_whisper_settings
+        self.parent.screenshot_settings = self.new_screenshot_settings
+        self.parent.burst_settings = self.new_burst_settings
+        self.parent.time_settings = self.new_time_settings
+        control_changed = self.parent.control_settings != self.new_control_settings
+        self.parent.control_settings = self.new_control_settings
         self.parent.timestamp_manager.set_output_dir(self.new_output_folder)
         self.parent.timestamp_manager.set_mic_device(self.new_mic_device_index)
+        self.parent.timestamp_manager.set_whisper_options(**self.new_whisper_settings)
+        self.parent.timestamp_manager.set_screenshot_profile(**self.new_screenshot_settings)
+        self.parent.timestamp_manager.set_burst_options(**self.new_burst_settings)
+        self.parent.timestamp_manager.set_time_format(**self.new_time_settings)
+        if control_changed:
+            self.parent.apply_control_settings()
         self.parent.save_keybinds()
         self.parent.update_button_text()
         self.destroy()
 
+class SearchWindow(ctk.CTkToplevel):
+    """Full-text search over every session file in the output folder."""
+    SEARCH_DELAY_MS = 150  # Wait for a pause in typing before querying
+
+    def __init__(self, parent):
+        super().__init__(parent.root)
+        self.parent = parent
+        self.title("Search Sessions")
+        self.transient(parent.root)
+        self.resizable(True, True)
+        self.index = None  # Main-thread SessionIndex, opened once the background update is done
+        self.hits = []
+        self._search_job = None
+
+        self.create_widgets()
+        self.minsize(480, 320)
+        self.geometry("640x420")
+        self.query_entry.focus_set()
+
+        # Bring the index up to date off the Tk thread; searching waits for it
+        Thread(target=self._update_index, args=(parent.output_folder,), daemon=True).start()
+
+    def create_widgets(self):
+        frame = ctk.CTkFrame(self, fg_color="transparent")
+        frame.pack(expand=True, fill=tk.BOTH, padx=12, pady=12)
+        frame.grid_rowconfigure(1, weight=1)
+        frame.grid_columnconfigure(0, weight=1)
+
+        self.query_entry = ctk.CTkEntry(frame, placeholder_text="Search marks, notes, scenes and voice notes…")
+        self.query_entry.grid(row=0, column=0, sticky='ew')
+        self.query_entry.bind("<KeyRelease>", self._schedule_search)
+        self.query_entry.bind("<Return>", lambda e: self._open_hit(0))
+
+        self.results = ctk.CTkTextbox(frame, wrap=tk.NONE, font=Theme.FONT_TEXT_AREA)
+        self.results.grid(row=1, column=0, sticky='nsew', pady=(8, 4))
+        self.results.bind("<Double-Button-1>", self._on_double_click)
+        self.results.configure(state="disabled")
+
+        self.status_label = ctk.CTkLabel(frame, text="Updating index…", font=Theme.FONT_BODY, text_color=Theme.GREY, anchor="w")
+        self.status_label.grid(row=2, column=0, sticky='ew')
+
+    def _update_index(self, folder):
+        from timestamp_index import SessionIndex
+
+        start = time.perf_counter()
+        try:
+            index = SessionIndex(folder)
+            indexed, removed, _ = index.update()
+            index.close()
+            message = f"Index ready ({indexed} updated, {removed} removed, {(time.perf_counter() - start) * 1000:.0f} ms)"
+        except Exception as e:
+            message = None
+            print(f"[Search] Could not update the index: {e}")
+        self.after(0, lambda: self._on_index_ready(folder, message))
+
+    def _on_index_ready(self, folder, message):
+        if not self.winfo_exists():
+            return
+        if message is None:
+            self.status_label.configure(text="Could not build the search index", text_color=Theme.RED)
+            return
+        from timestamp_index import SessionIndex
+
+        self.index = SessionIndex(folder)
+        self.status_label.configure(text=message)
+        self._search()
+
+    def _schedule_search(self, event=None):
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._search)
+
+    def _search(self):
+        self._search_job = None
+        if self.index is None:
+            return
+        query = self.query_entry.get().strip()
+        start = time.perf_counter()
+        self.hits = self.index.search(query) if query else []
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.results.configure(state="normal")
+        self.results.delete("1.0", tk.END)
+        self.results.insert("1.0", "\n".join(str(hit) for hit in self.hits))
+        self.results.configure(state="disabled")
+        if query:
+            self.status_label.configure(text=f"{len(self.hits)} hits in {elapsed_ms:.1f} ms — double-click to open")
+
+    def _on_double_click(self, event):
+        line = int(self.results.index(f"@{event.x},{event.y}").split(".")[0])
+        self._open_hit(line - 1)
+        return "break"
+
+    def _open_hit(self, position):
+        if not 0 <= position < len(self.hits):
+            return
+        hit = self.hits[position]
+        manager = self.parent.timestamp_manager
+        if not os.path.exists(hit.path):
+            self.status_label.configure(text="That file no longer exists", text_color=Theme.RED)
+            return
+        if os.path.abspath(hit.path) != os.path.abspath(manager.current_file_path or ""):
+            if manager.stopwatch_running:
+                messagebox.showwarning("Recording", "Stop the current recording before opening another file.", parent=self)
+                return
+            self.parent.save_changes()
+            self.parent._on_file_opened(manager.open_file(hit.path))
+        if hit.line:
+            self.parent.text_viewer.see(f"{hit.line}.0")
+            self.parent.text_viewer.mark_set(tk.INSERT, f"{hit.line}.0")
+
+    def destroy(self):
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        if self.index:
+            self.index.close()
+        super().destroy()
+
+class AppControlSession(HeadlessSession):
+    """
+    Control API commands for the GUI, run on the Tk thread.
+
+    Recording, marks, shorts and captures go through the TimestampApp handlers,
+    so they drive OBS (replay buffer, start/stop recording) and update the HUD
+    exactly like the hotkeys; new and opened files become the last session.
+    """
+
+    def __init__(self, app):
+        super().__init__(app.timestamp_manager, app.output_folder)
+        self.app = app
+
+    def _cmd_new(self, arg, at_ns):
+        reply = super()._cmd_new(arg, at_ns)
+        if reply.startswith("ok"):
+            self.app._on_file_opened(self.manager.current_file_path)
+        return reply
+
+    def _cmd_open(self, arg, at_ns):
+        reply = super()._cmd_open(arg, at_ns)
+        if reply.startswith("ok"):
+            self.app._on_file_opened(self.manager.current_file_path)
+        return reply
+
+    def _cmd_start(self, arg, at_ns):
+        if not self.manager.current_file_path:
+            self._cmd_new("", at_ns)
+        return self._result(self.app.start_recording(at_ns=at_ns), "already recording")
+
+    def _cmd_mark(self, arg, at_ns):
+        if arg:
+            return super()._cmd_mark(arg, at_ns)
+        return self._result(self.app.mark_time(at_ns=at_ns), "not recording")
+
+    def _cmd_short(self, arg, at_ns):
+        return self._result(self.app.save_short(at_ns=at_ns), "no file open")
+
+    def _cmd_screenshot(self, arg, at_ns):
+        return self._result(self.app.take_screenshot(at_ns=at_ns), "not recording or capture failed")
+
+    def _cmd_burst(self, arg, at_ns):
+        return self._result(self.app.save_burst(at_ns=at_ns), "burst buffer is off or empty")
+
+    def _cmd_stop(self, arg, at_ns):
+        return self._result(self.app.stop_recording(at_ns=at_ns), "not recording")
+
+
 class TimestampApp:
     def __init__(self, root):
         self.root = root
@@ -503,16 +935,45 @@ class TimestampApp:
         self.root.grid_columnconfigure(0, weight=1)
 
         self.timestamp_manager = TimestampManager(base_path=get_base_path())
+        _startup_step("construct TimestampManager")
         self.keybinds_file = os.path.join(get_base_path(), 'keybinds.json')
         self.buttons = {}
         self.mini_widget = None
+        # Journal version the text viewer is synced to, and how many leading characters it mirrors
+        self._viewer_version = 0
+        self._viewer_len = 0
+        self._viewer_journal = None
         self.output_folder = os.path.join(get_base_path(), "Timestamp_TXT")  # default
         self.mic_device_index = None  # None = system default
         self.hud_enabled = True
         self.hud_opacity = 0.8
+        self.autosave_quiet_seconds = 2  # Save edits once typing has paused this long
+        self.last_session_file = None  # Resumed on startup if it was left recording
+        self._autosave_job = None
+        self._clean_digest = None  # Digest of the viewer text when it last matched the file
         self.obs_settings = {
             'host': 'localhost', 'port': 4455, 'password': '', 'auto_connect': False
         }
+        self.whisper_settings = {
+            'model_size': 'base', 'idle_unload_seconds': 600, 'prewarm': False, 'workers': 1,
+            'ptt_streaming': False, 'ptt_window_seconds': 8,
+        }
+        self.screenshot_settings = {
+            'format': 'png', 'png_compress_level': 1, 'quality': 85,
+            'max_width': 0, 'thumbnail_width': 0,
+        }
+        self.burst_settings = {
+            'enabled': False, 'fps': 2, 'seconds': 5, 'max_width': 1280, 'budget_mb': 64,
+        }
+        self.time_settings = {'style': 'seconds', 'fps': 60}
+        # Local control server for Stream Deck / scripts; off unless enabled in Settings
+        self.control_settings = {'enabled': False, 'socket_path': '', 'http_port': 0}
+        self.control_server = None
+        self.control_session = None
+        self._control_lock = Lock()  # Guards the two fields below against the server thread
+        self._control_pending = set()  # Futures of commands waiting for the Tk thread
+        self._control_closing = False  # Set while the server stops; new commands are refused
+        self._control_sync_pending = False
         self.obs_manager = OBSManager(self.timestamp_manager)
         
         self.action_labels = {
@@ -520,6 +981,7 @@ class TimestampApp:
             'mark_time': "Mark Time", 'stop_recording': "Stop Recording",
             'save_short': "Save Short", 'mark_voice_note': "Voice Note",
             'take_screenshot': "Take Screenshot", 'mark_ptt_voice_note': "PTT Voice Note",
+            'save_burst': "Save Burst",
             'custom_note_1': "Custom Note 1", 'custom_note_2': "Custom Note 2",
             'custom_note_3': "Custom Note 3", 'custom_note_4': "Custom Note 4",
             'custom_note_5': "Custom Note 5",
@@ -527,7 +989,7 @@ class TimestampApp:
         self.default_keybinds = {
             'create_file': 'f13', 'start_recording': 'f14', 'mark_time': 'f15',
             'stop_recording': 'f16', 'save_short': 'f18', 'mark_voice_note': 'f17',
-            'take_screenshot': 'f19', 'mark_ptt_voice_note': '',
+            'take_screenshot': 'f19', 'mark_ptt_voice_note': '', 'save_burst': '',
             'custom_note_1': 'f20', 'custom_note_2': 'f21', 'custom_note_3': 'f22',
             'custom_note_4': 'f23', 'custom_note_5': 'f24',
         }
@@ -538,16 +1000,20 @@ class TimestampApp:
         }
         self.custom_texts = {}
         self.load_keybinds()
+        _startup_step("load keybinds.json")
 
         self._create_widgets()
         self.update_button_text()
+        _startup_step("build main window widgets")
         
         self.timestamp_manager.register_gui_callback(self.on_transcription_status)
         self._setup_obs()
 
-        self.auto_save()
         self._start_keyboard_listener()
+        self.apply_control_settings()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        _startup_step("OBS setup, key listener and control API")
+        self._resume_last_session()
 
     def _create_widgets(self):
         self._create_header()
@@ -579,6 +1045,25 @@ class TimestampApp:
                     self.obs_settings.update(saved_obs)
                 self.hud_enabled = data.get('hud_enabled', True)
                 self.hud_opacity = data.get('hud_opacity', 0.8)
+                self.autosave_quiet_seconds = data.get('autosave_quiet_seconds', 2)
+                self.last_session_file = data.get('last_session_file')
+                # Load saved voice transcription settings
+                saved_whisper = data.get('whisper_settings', {})
+                if saved_whisper:
+                    self.whisper_settings.update(saved_whisper)
+                # Load saved screenshot settings
+                saved_shots = data.get('screenshot_settings', {})
+                if saved_shots:
+                    self.screenshot_settings.update(saved_shots)
+                saved_burst = data.get('burst_settings', {})
+                if saved_burst:
+                    self.burst_settings.update(saved_burst)
+                saved_time = data.get('time_settings', {})
+                if saved_time:
+                    self.time_settings.update(saved_time)
+                saved_control = data.get('control_settings', {})
+                if saved_control:
+                    self.control_settings.update(saved_control)
             else:
                 self.keybinds = data
                 self.custom_texts = {}
@@ -593,10 +1078,15 @@ class TimestampApp:
         except (FileNotFoundError, json.JSONDecodeError):
             self.keybinds = self.default_keybinds.copy()
             self.custom_texts = self.default_texts.copy()
+        self._rebuild_hotkey_index()
         
         # Apply the (possibly loaded) output folder and mic device to the manager
         self.timestamp_manager.set_output_dir(self.output_folder)
         self.timestamp_manager.set_mic_device(self.mic_device_index)
+        self.timestamp_manager.set_whisper_options(**self.whisper_settings)
+        self.timestamp_manager.set_screenshot_profile(**self.screenshot_settings)
+        self.timestamp_manager.set_burst_options(**self.burst_settings)
+        self.timestamp_manager.set_time_format(**self.time_settings)
         self.save_keybinds()
 
     def save_keybinds(self):
@@ -609,6 +1099,13 @@ class TimestampApp:
                 'obs_settings': self.obs_settings,
                 'hud_enabled': self.hud_enabled,
                 'hud_opacity': self.hud_opacity,
+                'autosave_quiet_seconds': self.autosave_quiet_seconds,
+                'last_session_file': self.last_session_file,
+                'whisper_settings': self.whisper_settings,
+                'screenshot_settings': self.screenshot_settings,
+                'burst_settings': self.burst_settings,
+                'time_settings': self.time_settings,
+                'control_settings': self.control_settings,
             }
             json.dump(data, f, indent=4)
 
@@ -616,12 +1113,26 @@ class TimestampApp:
         self.save_changes()
         self.save_keybinds()
         self.obs_manager.disconnect()
+        if self.control_server:
+            # Don't wait for the server thread: the window is going away regardless
+            self._stop_control_server(timeout=0)
+        self.timestamp_manager.close()
+        if len(self.timestamp_manager.stamp_latency):
+            print(self.timestamp_manager.stamp_latency.summary())
         print("Final autosave and keybinds saved before closing")
         self.root.destroy()
 
-    def auto_save(self):
+    def schedule_autosave(self, event=None):
+        """Debounce: save the viewer's edits once it has been quiet for autosave_quiet_seconds."""
+        if not self.text_viewer.edit_modified():
+            return
+        if self._autosave_job:
+            self.root.after_cancel(self._autosave_job)
+        self._autosave_job = self.root.after(int(self.autosave_quiet_seconds * 1000), self._autosave)
+
+    def _autosave(self):
+        self._autosave_job = None
         self.save_changes()
-        self.root.after(60000, self.auto_save)
 
     def _create_header(self):
         header_container = ctk.CTkFrame(self.root)
@@ -642,6 +1153,9 @@ class TimestampApp:
         self.text_viewer = ctk.CTkTextbox(text_frame, wrap=tk.WORD, font=Theme.FONT_TEXT_AREA)
         # Using pack so it expands naturally
         self.text_viewer.pack(expand=True, fill=tk.BOTH)
+        # <<Modified>> fires when the first edit sets the flag; key releases restart the quiet period
+        self.text_viewer.bind("<<Modified>>", self.schedule_autosave)
+        self.text_viewer.bind("<KeyRelease>", self.schedule_autosave)
 
     def _create_filename_display(self):
         filename_frame = ctk.CTkFrame(self.root, fg_color="transparent")
@@ -700,7 +1214,9 @@ class TimestampApp:
             self.buttons[action_id] = btn
 
         settings_btn = ctk.CTkButton(button_frame, text="Settings", command=self.open_settings_window, fg_color=Theme.GREY, hover_color=Theme.HOVER_GREY, font=Theme.FONT_BUTTON)
-        settings_btn.grid(row=4, column=0, columnspan=2, padx=4, pady=4, sticky='ew')
+        settings_btn.grid(row=4, column=0, padx=4, pady=4, sticky='ew')
+        search_btn = ctk.CTkButton(button_frame, text="Search", command=self.open_search_window, fg_color=Theme.GREY, hover_color=Theme.HOVER_GREY, font=Theme.FONT_BUTTON)
+        search_btn.grid(row=4, column=1, padx=4, pady=4, sticky='ew')
 
     def update_button_text(self):
         for action_id, button in self.buttons.items():
@@ -712,10 +1228,16 @@ class TimestampApp:
     def open_settings_window(self):
         SettingsWindow(self)
 
+    def open_search_window(self):
+        self.save_changes()  # So the index sees the viewer's latest edits
+        SearchWindow(self)
+
     def get_key_str(self, key) -> str:
-        if hasattr(key, 'name'): return key.name
-        if hasattr(key, 'char'): return key.char
-        return 'unknown'
+        return hotkey_name(key)
+
+    def _rebuild_hotkey_index(self):
+        """Swap in a fresh hotkey dispatcher; call whenever self.keybinds changes."""
+        self.hotkeys = HotkeyDispatcher(self.keybinds)
 
     def _start_keyboard_listener(self):
         self.action_map = {
@@ -723,38 +1245,35 @@ class TimestampApp:
             'mark_time': self.mark_time, 'stop_recording': self.stop_recording,
             'save_short': self.save_short, 'mark_voice_note': self.mark_voice_note,
             'mark_ptt_voice_note': self.start_ptt_voice_note,
-            'custom_note_1': lambda: self.mark_custom_note_n('custom_note_1'),
-            'custom_note_2': lambda: self.mark_custom_note_n('custom_note_2'),
-            'custom_note_3': lambda: self.mark_custom_note_n('custom_note_3'),
-            'custom_note_4': lambda: self.mark_custom_note_n('custom_note_4'),
-            'custom_note_5': lambda: self.mark_custom_note_n('custom_note_5'),
+            'save_burst': self.save_burst,
+            'custom_note_1': lambda at_ns=None: self.mark_custom_note_n('custom_note_1', at_ns),
+            'custom_note_2': lambda at_ns=None: self.mark_custom_note_n('custom_note_2', at_ns),
+            'custom_note_3': lambda at_ns=None: self.mark_custom_note_n('custom_note_3', at_ns),
+            'custom_note_4': lambda at_ns=None: self.mark_custom_note_n('custom_note_4', at_ns),
+            'custom_note_5': lambda at_ns=None: self.mark_custom_note_n('custom_note_5', at_ns),
         }
-        self.pressed_keys = set()
-        Thread(target=lambda: keyboard.Listener(on_press=self._on_press, on_release=self._on_release).start(), daemon=True).start()
+        # pynput is imported on the listener thread so it does not hold up the first frame
+        Thread(target=lambda: load_keyboard().Listener(on_press=self._on_press, on_release=self._on_release).start(), daemon=True).start()
 
     def _on_press(self, key):
-        key_str = self.get_key_str(key)
-        if key_str in self.pressed_keys:
-            return  # Prevent auto-repeat triggers
-        self.pressed_keys.add(key_str)
-        
-        # Only map non-empty keybinds
-        key_to_action = {v: k for k, v in self.keybinds.items() if v}
-        action_id = key_to_action.get(key_str)
+        # Stamped in the dispatcher, before the Tk queue and any file I/O delay the action
+        hit = self.hotkeys.press(key)
+        if hit is None:
+            return  # Unbound key, or auto-repeat
+        action_id, at_ns = hit
+
         if action_id in self.action_map:
             try:
-                self.root.after(0, self.action_map[action_id])
+                action = self.action_map[action_id]
+                self.root.after(0, lambda: action(at_ns=at_ns))
             except Exception as e:
                 print(f"Error executing action '{action_id}': {e}")
                 
     def _on_release(self, key):
-        key_str = self.get_key_str(key)
-        if key_str in self.pressed_keys:
-            self.pressed_keys.remove(key_str)
-            
-        key_to_action = {v: k for k, v in self.keybinds.items() if v}
-        action_id = key_to_action.get(key_str)
-        
+        action_id = self.hotkeys.release(key)
+        if action_id is None:
+            return
+
         # Handle features that require an explicit release trigger
         if action_id == 'mark_ptt_voice_note':
             try:
@@ -762,34 +1281,60 @@ class TimestampApp:
             except Exception as e:
                 print(f"Error executing release action '{action_id}': {e}")
 
-    def create_file(self):
+    def create_file(self, at_ns=None):
         file_path = self.timestamp_manager.create_file()
-        if file_path: self.update_text_viewer(); self._update_filename_display()
+        if file_path: self._on_file_opened(file_path)
+        return file_path
 
-    def start_recording(self, from_obs=False):
+    def _on_file_opened(self, file_path):
+        self.last_session_file = file_path
+        self.save_keybinds()
+        self.update_text_viewer()
+        self._update_filename_display()
+        # A session resumed at startup brings its HUD back
+        if self.timestamp_manager.stopwatch_running and self.hud_enabled:
+            if self.mini_widget is None or not self.mini_widget.winfo_exists():
+                self.mini_widget = RecordingWidget(self)
+            else:
+                self.mini_widget.show_widget()
+
+    def _resume_last_session(self):
+        """Reopen the last session file if the app closed or crashed while it was recording."""
+        path = self.last_session_file
+        if path and os.path.exists(path) and TimestampManager.was_recording(path):
+            self._on_file_opened(self.timestamp_manager.open_file(path, resume=True))
+
+    def start_recording(self, from_obs=False, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
-        if self.timestamp_manager.start_recording():
+        started = self.timestamp_manager.start_recording(at_ns=at_ns)
+        if started:
             self.update_text_viewer()
             if self.hud_enabled:
                 if self.mini_widget is None or not self.mini_widget.winfo_exists():
                     self.mini_widget = RecordingWidget(self)
                 else:
-                    self.mini_widget.deiconify()
-                    self.mini_widget.update_timer()
+                    self.mini_widget.show_widget()
             
             if not from_obs:
                 self.obs_manager.start_obs_recording()
+        return started
 
-    def mark_time(self):
+    def mark_time(self, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
-        if self.timestamp_manager.mark_time():
+        elapsed = self.timestamp_manager.mark_time(at_ns=at_ns)
+        if elapsed:
             self.update_text_viewer()
             if self.mini_widget and self.mini_widget.winfo_exists():
                 self.mini_widget.show_status("Timestamp Marked!", color=Theme.BLUE)
+        return elapsed
 
-    def stop_recording(self, from_obs=False):
+    def stop_recording(self, from_obs=False, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
-        if self.timestamp_manager.stop_recording():
+        stopped = self.timestamp_manager.stop_recording(at_ns=at_ns)
+        if stopped:
             self.update_text_viewer()
             if self.mini_widget and self.mini_widget.winfo_exists():
                 self.mini_widget.destroy()
@@ -797,9 +1342,11 @@ class TimestampApp:
                 
             if not from_obs:
                 self.obs_manager.stop_obs_recording()
+        return stopped
 
-    def save_short(self):
+    def save_short(self, at_ns=None):
         """Save Short marker — also triggers OBS replay buffer save if connected."""
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
         
         is_error = False
@@ -808,30 +1355,45 @@ class TimestampApp:
             if not success:
                 is_error = True
                 
-        if self.timestamp_manager.save_short(error=is_error):
+        elapsed = self.timestamp_manager.save_short(error=is_error, at_ns=at_ns)
+        if elapsed:
             self.update_text_viewer()
             if self.mini_widget and self.mini_widget.winfo_exists():
                 if is_error:
                     self.mini_widget.show_status("Replay Error!", color=Theme.RED)
                 else:
                     self.mini_widget.show_status("Short Saved!", color=Theme.TURQUOISE)
+        return elapsed
 
-    def mark_voice_note(self):
+    def mark_voice_note(self, at_ns=None):
         self.save_changes()
-        self.mark_time()
+        self.mark_time(at_ns)
         if self.timestamp_manager.mark_voice_note():
             pass
 
-    def take_screenshot(self):
+    def take_screenshot(self, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
-        if self.timestamp_manager.take_screenshot():
+        elapsed = self.timestamp_manager.take_screenshot(at_ns=at_ns)
+        if elapsed:
             self.update_text_viewer()
             if self.mini_widget and self.mini_widget.winfo_exists():
                 self.mini_widget.show_status("Screenshot Saved!", color=Theme.TURQUOISE)
+        return elapsed
 
-    def start_ptt_voice_note(self):
+    def save_burst(self, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
-        self.mark_time()
+        elapsed = self.timestamp_manager.save_burst(at_ns=at_ns)
+        if elapsed:
+            self.update_text_viewer()
+            if self.mini_widget and self.mini_widget.winfo_exists():
+                self.mini_widget.show_status("Burst Saved!", color=Theme.TURQUOISE)
+        return elapsed
+
+    def start_ptt_voice_note(self, at_ns=None):
+        self.save_changes()
+        self.mark_time(at_ns)
         if self.timestamp_manager.start_ptt_voice_note():
             pass
             
@@ -839,6 +1401,86 @@ class TimestampApp:
         if self.timestamp_manager.stop_ptt_voice_note():
             pass
 
+    def apply_control_settings(self):
+        """Start, restart or stop the local control server to match control_settings."""
+        if self.control_server:
+            self._stop_control_server()
+        s = self.control_settings
+        if not s.get('enabled'):
+            return
+        from timestamp_control import ControlServer
+        # Commands go through the same handlers as the hotkeys (OBS replay and
+        # recording, last session file), on the Tk thread; the window catches up once per batch.
+        self.control_session = AppControlSession(self)
+        self.control_server = ControlServer(
+            self._control_execute, s.get('socket_path') or None, s.get('http_port', 0),
+            on_activity=self._on_control_activity,
+        )
+        with self._control_lock:
+            self._control_closing = False
+        if not self.control_server.start():
+            messagebox.showerror("Control API", f"Could not start the control server:\n{self.control_server.error}")
+            self.control_server = None
+
+    def _stop_control_server(self, timeout=5):
+        """
+        Stop the control server from the Tk thread.
+
+        Commands still waiting for this thread are cancelled first, so the server
+        thread replies with an error at once instead of blocking the join.
+        """
+        with self._control_lock:
+            self._control_closing = True
+            pending, self._control_pending = self._control_pending, set()
+        for future in pending:
+            future.cancel()
+        self.control_server.stop(timeout)
+        self.control_server = None
+
+    def _control_execute(self, line, at_ns):
+        """Called from the control server thread — run one command on the main thread and wait for its reply."""
+        future = Future()
+        with self._control_lock:
+            if self._control_closing:
+                return "error the control server is stopping"
+            self._control_pending.add(future)
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                future.set_result(self.control_session.execute(line, at_ns))
+
+        try:
+            self.root.after(0, run)
+            return future.result(CONTROL_REPLY_TIMEOUT)
+        except CancelledError:
+            return "error the control server is stopping"
+        except FutureTimeout:
+            future.cancel()  # Still queued: drop it rather than run it late
+            return "error the app did not respond in time"
+        finally:
+            with self._control_lock:
+                self._control_pending.discard(future)
+
+    def _on_control_activity(self):
+        """Called from the control server thread — coalesce refreshes onto the main thread."""
+        if self._control_closing:
+            return  # The window may already be gone
+        if not self._control_sync_pending:
+            self._control_sync_pending = True
+            self.root.after(0, self._sync_after_control)
+
+    def _sync_after_control(self):
+        self._control_sync_pending = False
+        self.update_text_viewer()
+        self._update_filename_display()
+        running = self.timestamp_manager.stopwatch_running
+        hud_open = self.mini_widget is not None and self.mini_widget.winfo_exists()
+        if running and self.hud_enabled and not hud_open:
+            self.mini_widget = RecordingWidget(self)
+        elif not running and hud_open:
+            self.mini_widget.destroy()
+            self.mini_widget = None
+
     def _setup_obs(self):
         """Register OBS callbacks and auto-connect if configured."""
         self.obs_manager.register_callbacks(
@@ -899,10 +1541,11 @@ class TimestampApp:
                 self.mini_widget.show_status("💾 Replay Saved!", color=Theme.TURQUOISE)
         self.root.after(0, update)
 
-    def mark_custom_note_n(self, action_id):
+    def mark_custom_note_n(self, action_id, at_ns=None):
+        at_ns = at_ns if at_ns is not None else SessionClock.now_ns()
         self.save_changes()
         custom_text = self.custom_texts.get(action_id, "")
-        if self.timestamp_manager.mark_custom_note(custom_text):
+        if self.timestamp_manager.mark_custom_note(custom_text, at_ns=at_ns):
             self.update_text_viewer()
             if self.mini_widget and self.mini_widget.winfo_exists():
                 self.mini_widget.show_status(f"Added: {custom_text}", color=Theme.BLUE)
@@ -910,10 +1553,8 @@ class TimestampApp:
     def on_transcription_status(self, status):
         def update_gui():
             if status.startswith("COMPLETE|"):
-                transcription = status.split("|", 1)[1]
-                if transcription:
-                    self.text_viewer.insert(tk.END, f" **Voice Note:** {transcription}\n")
-                self.save_changes()
+                # The manager has already written the note next to its mark
+                self.update_text_viewer()
                 
                 key_name = self.keybinds.get('mark_voice_note', '').upper()
                 if not key_name: key_name = 'UNBOUND'
@@ -922,8 +1563,10 @@ class TimestampApp:
                     self.buttons['mark_voice_note'].configure(text=f"{label_text} ({key_name})")
                 self.text_viewer.see(tk.END)
                 
+                pending = self.timestamp_manager.transcription_queue_depth()
                 if self.mini_widget and self.mini_widget.winfo_exists():
-                    self.mini_widget.show_status("Transcribed!", duration=4000, color=Theme.GREEN)
+                    message = f"Transcribed! ({pending} queued)" if pending else "Transcribed!"
+                    self.mini_widget.show_status(message, duration=4000, color=Theme.GREEN)
                 self.voice_status_label.configure(text="")
             else:
                 if 'mark_voice_note' in self.buttons:
@@ -933,10 +1576,10 @@ class TimestampApp:
                     self.mini_widget.show_status(status, duration=10000, color=Theme.PURPLE)
                     
                 # Update main GUI voice status header
-                if "error" in status.lower() or "no audio" in status.lower():
+                if "error" in status.lower() or "no audio" in status.lower() or "full" in status.lower():
                     self.voice_status_label.configure(text=status, text_color=Theme.RED)
                 elif "transcribing" in status.lower():
-                    self.voice_status_label.configure(text="⏳ Transcribing...", text_color=Theme.ORANGE)
+                    self.voice_status_label.configure(text=f"⏳ {status}", text_color=Theme.ORANGE)
                 elif "recording" in status.lower():
                     self.voice_status_label.configure(text="🎙️ RECORDING...", text_color=Theme.RED)
                     import re
@@ -951,20 +1594,85 @@ class TimestampApp:
         self.root.after(0, update_gui)
             
     def save_changes(self):
-        if self.timestamp_manager.current_file_path:
-            self.timestamp_manager.save_changes(self.text_viewer.get("1.0", tk.END))
+        # Only user edits need saving; appended events are already on disk.
+        if self.timestamp_manager.current_file_path and self.text_viewer.edit_modified():
+            if self._autosave_job:
+                self.root.after_cancel(self._autosave_job)
+                self._autosave_job = None
+            edited = self.text_viewer.get("1.0", "end-1c")
+            digest = hashlib.blake2b(edited.encode("utf-8"), digest_size=16).digest()
+            if digest == self._clean_digest:
+                # Edited and then changed back (e.g. typed and undone) — nothing to write
+                self.text_viewer.edit_modified(False)
+                return
+            version = self.timestamp_manager.save_changes(edited, base_version=self._viewer_version)
+            if version is not None:
+                # The viewer already shows the edits; anything appended meanwhile comes in as a tail.
+                self._viewer_version = version
+                self._viewer_len = len(edited)
+                self._clean_digest = digest
+            self.text_viewer.edit_modified(False)
+            self.update_text_viewer()
 
     def update_text_viewer(self):
-        text_content = self.timestamp_manager.read_file_content()
-        self.text_viewer.delete("1.0", tk.END)
-        self.text_viewer.insert(tk.END, text_content)
-        self.text_viewer.see(tk.END)
+        journal = self.timestamp_manager.journal
+        if journal is None:
+            return
+        if journal is not self._viewer_journal:
+            # A different file was opened — start from an empty view
+            self._viewer_journal = journal
+            self._viewer_version = 0
+            self._viewer_len = 0
+            self.text_viewer.delete("1.0", tk.END)
+
+        # Keep the user's unsaved-edits flag; our own inserts must not set or clear it
+        dirty = self.text_viewer.edit_modified()
+        version, offset, tail = journal.changes_since(self._viewer_version, self._viewer_len)
+        at_bottom = self.text_viewer.yview()[1] >= 0.999
+        if offset == self._viewer_len:
+            # Pure append: only the new tail touches the widget
+            if tail:
+                self.text_viewer.insert("end-1c", tail)
+        else:
+            # Something before the end changed — reload but keep the cursor and scroll position
+            cursor = self.text_viewer.index(tk.INSERT)
+            first_visible = self.text_viewer.yview()[0]
+            version, text_content = journal.snapshot()
+            offset, tail = 0, text_content
+            self.text_viewer.delete("1.0", tk.END)
+            self.text_viewer.insert(tk.END, text_content)
+            self.text_viewer.mark_set(tk.INSERT, cursor)
+            self.text_viewer.yview_moveto(first_visible)
+        if at_bottom:
+            self.text_viewer.see(tk.END)
+
+        if tail:
+            self._clean_digest = None  # The viewer text changed; its digest is unknown until the next save
+        self._viewer_version = version
+        self._viewer_len = offset + len(tail)
+        self.text_viewer.edit_modified(dirty)
+
+def print_startup_profile():
+    """Print the --profile-startup breakdown against STARTUP_BUDGET_MS."""
+    total_ms = (time.perf_counter() - _startup_t0) * 1000
+    print("Startup profile (ms)")
+    for label, seconds in _startup_steps:
+        print(f"  {label:<44}{seconds * 1000:>8.1f}")
+    verdict = "within" if total_ms <= STARTUP_BUDGET_MS else "OVER"
+    print(f"  {'total to first frame':<44}{total_ms:>8.1f}  ({verdict} {STARTUP_BUDGET_MS} ms budget)")
 
 def main():
     ctk.set_appearance_mode("Dark")
     ctk.set_default_color_theme("blue")
     root = ctk.CTk()
+    _startup_step("create root window")
     app = TimestampApp(root)
+    if "--profile-startup" in sys.argv:
+        def first_frame():
+            root.update_idletasks()
+            _startup_step("first frame drawn")
+            print_startup_profile()
+        root.after_idle(first_frame)
     root.mainloop()
 
 if __name__ == "__main__":
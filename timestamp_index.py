@@ -0,0 +1,250 @@
+"""
+timestamp_index.py — Full-text search across every session file in the output folder.
+
+Keeps a SQLite FTS5 index (`.timestamp_index.sqlite` in the output folder)
+of the marks, notes, scene markers and voice-note text in each session
+file, parsed with timestamp_parser. Updates are incremental: only files
+whose size or mtime changed since the last run are re-read, and deleted
+files are dropped.
+
+CLI:
+    python timestamp_index.py "clutch"               # search the app's output folder
+    python timestamp_index.py --dir D:/Timestamp_TXT --rebuild boss fight
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+from timestamp_functions import TimelineEvent
+from timestamp_parser import TEXT, parse_file
+
+INDEX_NAME = ".timestamp_index.sqlite"
+SESSION_EXTENSIONS = (".md", ".txt")
+SKIP_DIRS = {"Screenshots", "Exports"}  # Images, and timestamp_export output
+FILE_TITLE = "file"  # Kind of the per-file entry holding the file name
+
+# Entry kinds worth searching; screenshots and bare marks carry no text
+INDEXED_KINDS = {
+    TimelineEvent.MARK, TimelineEvent.VOICE, TimelineEvent.LATE_VOICE,
+    TimelineEvent.SCENE, TimelineEvent.SHORT, TEXT,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    counter INTEGER,
+    time TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_file ON entries(file_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    text, content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class SearchHit:
+    """One search result: where it is and a highlighted snippet of the matching text."""
+    __slots__ = ("path", "line", "kind", "counter", "time", "snippet")
+
+    def __init__(self, path, line, kind, counter, time, snippet):
+        self.path = path
+        self.line = line
+        self.kind = kind
+        self.counter = counter
+        self.time = time
+        self.snippet = snippet
+
+    def __str__(self):
+        where = f"{os.path.basename(self.path)}:{self.line}"
+        mark = f"[{self.counter}] {self.time} " if self.counter is not None else ""
+        return f"{where}  {mark}{self.snippet}"
+
+
+def session_files(root):
+    """Yield an os.DirEntry for every session file under `root`, skipping hidden and output folders."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    stack.append(entry.path)
+            elif entry.name.lower().endswith(SESSION_EXTENSIONS):
+                yield entry
+
+
+def match_query(text):
+    """Turn what the user typed into an FTS5 query: every word, as a prefix, in any order."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+class SessionIndex:
+    """
+    Incremental FTS5 index over the session files under `root`.
+
+    One instance holds one SQLite connection, so use it from a single thread;
+    a second instance can search while another updates (WAL mode).
+    """
+
+    def __init__(self, root, db_path=None):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.db_path = db_path or os.path.join(self.root, INDEX_NAME)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # The index can always be rebuilt from the files
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, rebuild=False):
+        """
+        Bring the index up to date with the files on disk.
+
+        Args:
+            rebuild (bool): Re-read every file instead of only changed ones.
+
+        Returns:
+            tuple: (files re-indexed, files removed, files unchanged).
+        """
+        known = {path: (file_id, mtime_ns, size)
+                 for file_id, path, mtime_ns, size in self.conn.execute("SELECT id, path, mtime_ns, size FROM files")}
+        indexed = unchanged = 0
+        with self.conn:
+            for entry in session_files(self.root):
+                path = os.path.relpath(entry.path, self.root)
+                stat = entry.stat()
+                mtime_ns, size = stat.st_mtime_ns, stat.st_size
+                previous = known.pop(path, None)
+                if previous and not rebuild and previous[1:] == (mtime_ns, size):
+                    unchanged += 1
+                    continue
+                if previous:
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (previous[0],))
+                self._index_file(path, mtime_ns, size)
+                indexed += 1
+            # Whatever is left was deleted or moved away
+            for file_id, _, _ in known.values():
+                self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        return indexed, len(known), unchanged
+
+    def _index_file(self, path, mtime_ns, size):
+        file_id = self.conn.execute(
+            "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (path, mtime_ns, size)
+        ).lastrowid
+        title = os.path.splitext(os.path.basename(path))[0]
+        rows = [(file_id, 0, FILE_TITLE, None, None, title)]
+        try:
+            for entry in parse_file(os.path.join(self.root, path)):
+                if entry.kind in INDEXED_KINDS and entry.payload:
+                    rows.append((file_id, entry.line_no, entry.kind, entry.counter, entry.time, entry.payload))
+        except OSError as e:
+            print(f"[Index] Could not read {path}: {e}")
+        self.conn.executemany(
+            "INSERT INTO entries (file_id, line, kind, counter, time, text) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+
+    def search(self, text, limit=50, raw=False):
+        """
+        Find entries matching `text`, best matches first.
+
+        Args:
+            text (str): Words to look for (prefix matches), or an FTS5 query if `raw`.
+            limit (int): Maximum number of hits.
+            raw (bool): Pass `text` to FTS5 unchanged (phrases, NEAR, OR, ...).
+
+        Returns:
+            list[SearchHit]: Matches with absolute paths and [bracketed] snippets.
+        """
+        query = text if raw else match_query(text)
+        if not query:
+            return []
+        rows = self.conn.execute(
+            """
+            SELECT files.path, entries.line, entries.kind, entries.counter, entries.time,
+                   snippet(entries_fts, 0, '[', ']', '…', 12)
+            FROM entries_fts
+            JOIN entries ON entries.id = entries_fts.rowid
+            JOIN files ON files.id = entries.file_id
+            WHERE entries_fts MATCH ?
+            ORDER BY bm25(entries_fts)
+            LIMIT ?
+            """,
+            (query, limit),
+        )
+        return [SearchHit(os.path.join(self.root, path), *rest) for path, *rest in rows]
+
+
+def default_output_dir():
+    """The app's output folder: keybinds.json's output_folder, else Timestamp_TXT next to this script."""
+    import json
+
+    base = os.path.dirname(os.path.abspath(__file__))
+    try:
+        with open(os.path.join(base, "keybinds.json")) as f:
+            folder = json.load(f).get("output_folder")
+        if folder:
+            return folder
+    except (OSError, ValueError, AttributeError):
+        pass
+    return os.path.join(base, "Timestamp_TXT")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search every timestamp session file in the output folder.")
+    parser.add_argument("query", nargs="*", help="Words to find (prefix matches); omit to just update the index")
+    parser.add_argument("--dir", default=None, help="Folder of session files (default: the app's output folder)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every file")
+    parser.add_argument("--raw", action="store_true", help="Treat the query as FTS5 syntax")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    index = SessionIndex(args.dir or default_output_dir())
+    start = time.perf_counter()
+    indexed, removed, unchanged = index.update(rebuild=args.rebuild)
+    print(f"Index: {indexed} updated, {removed} removed, {unchanged} unchanged "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    if args.query:
+        start = time.perf_counter()
+        try:
+            hits = index.search(" ".join(args.query), args.limit, raw=args.raw)
+        except sqlite3.OperationalError as e:
+            parser.error(f"bad query: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for hit in hits:
+            print(hit)
+        print(f"{len(hits)} hits in {elapsed_ms:.1f} ms")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
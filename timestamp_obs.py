@@ -185,20 +185,18 @@ class OBSManager:
     def on_current_program_scene_changed(self, data):
         """
         Writes a scene marker to the log file, then notifies the GUI to refresh.
-        File I/O is safe from this thread; GUI refresh goes via callback.
+        The write goes through the session journal, so it is appended rather than
+        racing the GUI's saves; GUI refresh goes via callback.
         """
         scene_name = data.scene_name
         tm = self.timestamp_manager
 
-        # Only log if a recording session is active
-        if tm.current_file_path and tm.stopwatch_running:
-            line = f"\n📺  **Scene →** {scene_name}"
-            try:
-                with open(tm.current_file_path, "a", encoding="utf-8") as f:
-                    f.write(line)
+        # Only logged if a recording session is active
+        try:
+            if tm.mark_scene(scene_name):
                 self._fire(self._on_scene_change, scene_name)
-            except Exception as e:
-                print(f"[OBS] Scene marker write error: {e}")
+        except Exception as e:
+            print(f"[OBS] Scene marker write error: {e}")
 
     # ── Internal: helpers ────────────────────────────────────────────────────
 
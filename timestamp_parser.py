@@ -0,0 +1,252 @@
+"""
+timestamp_parser.py — Read session Markdown files back into timeline entries.
+
+Turns the line formats written by TimestampManager into SessionEntry records:
+  - marks:       *  **[n]**   **[HH:MM:SS]** - note
+  - screenshots and bursts (mark lines with 📸 / 🎞️ embeds)
+  - voice notes: **Voice Note:** text, on a mark line or on its own late line
+  - 📺  **Scene →** name, ## SHORT - ..., ## ERROR - NO REPLAY BUFFER RUNNING
+  - ## 0 - Filename: ... (recording start) and Total Recording Time: ... (stop)
+Anything else that is not blank (the user's own notes) comes back as TEXT.
+
+Parsing is a single forward pass over a generator of lines. Files are read
+in fixed-size blocks, so memory use stays the same however long the log is.
+"""
+
+import re
+
+from timestamp_functions import TimelineEvent, read_lines_backwards
+
+TEXT = "text"  # Free-form line typed by the user
+
+READ_BLOCK = 64 * 1024  # Bytes read and decoded at a time by read_lines; keeps the peak well under 1 MB
+
+# One match yields the counter, the time as written and its parts, and the rest of the line
+_MARK = re.compile(
+    r"\*  \*\*\[(\d+)\]\*\*   \*\*(\[(\d+):(\d+):(\d+(?:\.\d+)?)(?::(\d+))?\])\*\* -(?: (.*))?$"
+)
+_TIME = re.compile(r"\[?(\d+):(\d+):(\d+(?:\.\d+)?)(?::(\d+))?\]?$")
+_SCENE_PREFIX = "📺  **Scene →**"
+_START_PREFIX = "## 0 - Filename:"
+_SHORT = re.compile(r"## SHORT - (.*?)(?: - ?)?$")
+_SHORT_ERROR_PREFIX = "## ERROR - NO REPLAY BUFFER RUNNING"
+_STOP = re.compile(r"Total Recording Time: (\[[0-9:.]+\])")
+_NOTES = re.compile(r"\* \*\*(?:Starting|Ending) Notes\*\* -(?: (.*))?$")
+_IMAGE_LINK = re.compile(r"\]\(Screenshots/([^)]+)\)")
+_VOICE_MARKER = "**Voice Note:**"
+_INLINE_VOICE = " " + _VOICE_MARKER  # Voice note appended to the end of an earlier line
+_SCREENSHOT_PREFIX = "📸 Screenshot →"
+_BURST_PREFIX = "🎞️ Burst →"
+
+
+class SessionEntry:
+    """
+    One entry read back from a session file.
+
+    Attributes:
+        kind (str): A TimelineEvent kind constant, or TEXT.
+        line_no (int): 1-based line number in the file.
+        take (int): Recording number within the file (1 for the first start, 0 before it).
+        counter (int): Mark number, or None.
+        time (str): Time as written, e.g. '[00:01:02]', or None.
+        seconds (float): `time` in seconds, or None.
+        payload (str): Note, scene name, voice transcription, or screenshot filename(s).
+    """
+    __slots__ = ("kind", "line_no", "take", "counter", "time", "seconds", "payload")
+
+    def __init__(self, kind, line_no, take, counter=None, time=None, seconds=None, payload=""):
+        self.kind = kind
+        self.line_no = line_no
+        self.take = take
+        self.counter = counter
+        self.time = time
+        self.seconds = seconds
+        self.payload = payload
+
+    def __repr__(self):
+        return (f"SessionEntry({self.kind!r}, line {self.line_no}, take {self.take}, "
+                f"counter={self.counter}, time={self.time!r}, payload={self.payload!r})")
+
+    def to_event(self):
+        """The TimelineEvent this entry was written from, or None for TEXT."""
+        if self.kind == TEXT:
+            return None
+        return TimelineEvent(self.kind, self.seconds, self.counter, self.payload)
+
+    def display(self):
+        """
+        HUD line for this entry, matching what the HUD showed when it was recorded.
+
+        Returns:
+            str: The line, or None if the entry is not shown on the HUD.
+        """
+        if self.kind == TEXT:
+            return self.payload.replace("**", "").strip() or None
+        # Show the time exactly as written, whatever format the file was recorded in
+        return self.to_event().display(lambda _: self.time)
+
+
+def parse_time(text, fps=60):
+    """
+    Convert a written time to seconds.
+
+    Accepts '[HH:MM:SS]', '[HH:MM:SS.mmm]' and '[HH:MM:SS:FF]' (frames at `fps`),
+    with or without brackets. Returns None if the text is not a time.
+    """
+    match = _TIME.match(text.strip())
+    if not match:
+        return None
+    return _seconds(*match.groups(), fps)
+
+
+def _seconds(hours, minutes, seconds, frames, fps):
+    total = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    if frames is not None:
+        total += int(frames) / fps
+    return total
+
+
+def parse_lines(lines, fps=60):
+    """
+    Yield SessionEntry records for an iterable of session file lines, in one pass.
+
+    A line can yield two entries: a mark (or scene, ...) followed by the voice
+    note written onto the end of it.
+
+    Args:
+        lines (Iterable[str]): Lines with or without their line endings.
+        fps (int): Frame rate used for '[HH:MM:SS:FF]' times.
+    """
+    take = 0
+    last_mark = (None, None, None)  # (counter, time, seconds) a stray voice note belongs to
+    mark_match = _MARK.match
+    for line_no, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        first = line[0]
+
+        # Marks are nearly every line of a long session; they take one regex match
+        if first == "*":
+            match = mark_match(line)
+            if match:
+                counter, time, hours, minutes, secs, frames, rest = match.groups()
+                counter = int(counter)
+                seconds = _seconds(hours, minutes, secs, frames, fps)
+                last_mark = (counter, time, seconds)
+                if not rest:
+                    yield SessionEntry(TimelineEvent.MARK, line_no, take, counter, time, seconds)
+                    continue
+                if rest.startswith(_VOICE_MARKER):
+                    # Voice note that finished after later entries were written
+                    yield SessionEntry(TimelineEvent.LATE_VOICE, line_no, take, counter, time, seconds,
+                                       rest[len(_VOICE_MARKER):].strip())
+                    continue
+                voice = None
+                if _VOICE_MARKER in rest:
+                    rest, _, voice = rest.partition(_INLINE_VOICE)
+                if rest.startswith(_SCREENSHOT_PREFIX):
+                    names = _IMAGE_LINK.findall(rest)
+                    yield SessionEntry(TimelineEvent.SCREENSHOT, line_no, take, counter, time, seconds,
+                                       names[-1] if names else "")
+                elif rest.startswith(_BURST_PREFIX):
+                    yield SessionEntry(TimelineEvent.BURST, line_no, take, counter, time, seconds,
+                                       " ".join(_IMAGE_LINK.findall(rest)))
+                else:
+                    yield SessionEntry(TimelineEvent.MARK, line_no, take, counter, time, seconds, rest.strip())
+                if voice is not None:
+                    yield SessionEntry(TimelineEvent.VOICE, line_no, take, counter, time, seconds, voice.strip())
+                continue
+
+        # A voice note whose mark was not the last entry lands at the end of whatever was
+        voice = None
+        if _VOICE_MARKER in line:
+            line, _, voice = line.partition(_VOICE_MARKER)
+            line = line.rstrip()
+        stripped = line.strip()
+        entry = None
+        if not stripped:
+            pass
+        elif first == "*":
+            match = _NOTES.match(line)
+            if match:
+                note = (match.group(1) or "").strip()
+                if note:
+                    entry = SessionEntry(TEXT, line_no, take, payload=note)
+            else:
+                entry = SessionEntry(TEXT, line_no, take, payload=stripped)
+        elif first == "📺" and line.startswith(_SCENE_PREFIX):
+            entry = SessionEntry(TimelineEvent.SCENE, line_no, take, payload=line[len(_SCENE_PREFIX):].strip())
+        elif first == "#":
+            if line.startswith(_START_PREFIX):
+                take += 1
+                entry = SessionEntry(TimelineEvent.START, line_no, take, payload=line[len(_START_PREFIX):].strip())
+            elif line.startswith(_SHORT_ERROR_PREFIX):
+                entry = SessionEntry(TimelineEvent.SHORT_ERROR, line_no, take)
+            else:
+                match = _SHORT.match(line)
+                payload = match.group(1).strip() if match else stripped
+                entry = SessionEntry(TimelineEvent.SHORT if match else TEXT, line_no, take, payload=payload)
+        elif first == "T":
+            match = _STOP.match(line)
+            if match:
+                time = match.group(1)
+                entry = SessionEntry(TimelineEvent.STOP, line_no, take, time=time, seconds=parse_time(time, fps))
+            else:
+                entry = SessionEntry(TEXT, line_no, take, payload=stripped)
+        elif stripped != "---":
+            entry = SessionEntry(TEXT, line_no, take, payload=stripped)
+
+        if entry is not None:
+            yield entry
+        if voice is not None:
+            yield SessionEntry(TimelineEvent.VOICE, line_no, take, *last_mark, voice.strip())
+
+
+def read_lines(path, block_size=READ_BLOCK):
+    """
+    Yield the lines of a UTF-8 file without their line endings.
+
+    Reads and decodes `block_size` bytes at a time; undecodable bytes become U+FFFD.
+    This splits lines faster than mmap + readline or text mode (see
+    benchmarks/bench_parser.py), and does not keep the file mapped while the
+    session writer may rewrite it; parsing, not reading, sets the overall rate.
+    """
+    with open(path, "rb") as file:
+        remainder = b""
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = remainder + block
+            end = block.rfind(b"\n") + 1
+            # Splitting at a newline never cuts a multi-byte character in half
+            remainder = block[end:]
+            if end:
+                yield from block[:end - 1].decode("utf-8", errors="replace").split("\n")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def parse_file(path, fps=60):
+    """Yield SessionEntry records from a session file, streaming it in blocks."""
+    return parse_lines(read_lines(path), fps)
+
+
+def tail_display_lines(path, count):
+    """
+    HUD lines for the last `count` shown entries of a session file, oldest first.
+
+    Reads the file backwards and stops as soon as it has enough, so the cost
+    does not depend on the length of the session.
+    """
+    shown = []
+    for line in read_lines_backwards(path):
+        # Entries of one line come out in order; the lines themselves arrive newest first
+        for entry in reversed(list(parse_lines((line,)))):
+            text = entry.display()
+            if text:
+                shown.append(text)
+                if len(shown) == count:
+                    return shown[::-1]
+    return shown[::-1]